@@ -2,22 +2,71 @@
 Base test class for Appium automation tests
 """
 
+import base64
 import os
 import time
 from datetime import datetime
-from appium import webdriver
 from appium.webdriver.common.appiumby import AppiumBy
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
-from config import APPIUM_SERVER_URL, ANDROID_CAPABILITIES, TEST_CREDENTIALS, TIMEOUTS
+from selenium.common.exceptions import TimeoutException, NoSuchElementException, WebDriverException
+from config import (
+    ANDROID_CAPABILITIES, TEST_CREDENTIALS, TIMEOUTS, SELECTOR_CACHE, SELECTOR_LOOKUP, LOGIN_REUSE,
+    SCREENSHOTS, NAVIGATION, SNAPSHOT_CACHE, ELEMENT_CACHE
+)
+from session_pool import create_driver
+from screen_wait import ScreenWait, element_present, spinner_gone, any_of, all_of, screen_settled
+from selector_cache import get_selector_cache
+from page_snapshot import HierarchySnapshot, snapshots_supported, snapshot_cache
+from element_cache import element_cache
+from screenshot_pipeline import get_screenshot_pipeline, ScreenshotRing
+from navigation import (
+    HOME_SCREEN_MARKER, MENU_SELECTORS, SCREENS, ARRIVAL_BUDGETS, detect_screen, screen_shown, shortest_route
+)
+from instrumentation import step
+from events import log, emit
+
+# Login outcome and duration per device, shared by every flow in this process
+LOGIN_CACHE = {}
+
+# Time spent in selector lookups, split by outcome
+LOOKUP_STATS = {
+    "hits": 0,
+    "hit_time": 0.0,
+    "misses": 0,
+    "miss_time": 0.0
+}
+
+
+def record_lookup(found, elapsed):
+    """Add one selector-chain lookup to LOOKUP_STATS"""
+    if found:
+        LOOKUP_STATS["hits"] += 1
+        LOOKUP_STATS["hit_time"] += elapsed
+    else:
+        LOOKUP_STATS["misses"] += 1
+        LOOKUP_STATS["miss_time"] += elapsed
+
+
+def print_lookup_report():
+    """Print time spent on selector hits versus misses"""
+    print("Selector Lookups:")
+    print("-" * 40)
+    print(f"Hits: {LOOKUP_STATS['hits']} ({LOOKUP_STATS['hit_time']:.1f}s)")
+    print(f"Misses: {LOOKUP_STATS['misses']} ({LOOKUP_STATS['miss_time']:.1f}s)")
+    print("-" * 40)
 
 
 class BaseTest:
-    def __init__(self):
+    def __init__(self, session_pool=None):
         self.driver = None
         self.wait = None
+        self.session_pool = session_pool
+        self.session = None
+        self.screen = "launch"
+        self.selector_cache = get_selector_cache() if SELECTOR_CACHE["enabled"] else None
         self.screenshots_dir = "../screenshots"
+        self.screenshot_ring = ScreenshotRing()
         self.ensure_screenshots_dir()
 
     def ensure_screenshots_dir(self):
@@ -25,48 +74,145 @@ class BaseTest:
         if not os.path.exists(self.screenshots_dir):
             os.makedirs(self.screenshots_dir)
 
+    @step
     def setup_driver(self):
-        """Initialize Appium driver"""
+        """Initialize Appium driver, borrowing from the session pool if one is set"""
         try:
-            self.driver = webdriver.Remote(APPIUM_SERVER_URL, ANDROID_CAPABILITIES)
-            self.driver.implicitly_wait(TIMEOUTS["implicit_wait"])
+            if self.session_pool:
+                self.session = self.session_pool.acquire()
+                self.driver = self.session.driver
+            else:
+                self.driver = create_driver()
             self.wait = WebDriverWait(self.driver, TIMEOUTS["explicit_wait"])
-            print("✓ Driver initialized successfully")
+            log("✓ Driver initialized successfully")
             return True
         except Exception as e:
-            print(f"✗ Failed to initialize driver: {str(e)}")
+            log(f"✗ Failed to initialize driver: {str(e)}")
             return False
 
+    @step
     def teardown_driver(self):
-        """Close Appium driver"""
-        if self.driver:
+        """Close Appium driver, or hand it back to the session pool"""
+        if self.selector_cache:
+            self.selector_cache.save()
+        if SCREENSHOTS["async"]:
+            get_screenshot_pipeline().flush()
+        if self.session:
+            self.session_pool.release(self.session)
+            self.session = None
+            self.driver = None
+            log("✓ Driver returned to session pool")
+        elif self.driver:
             try:
                 self.driver.quit()
-                print("✓ Driver closed successfully")
+                log("✓ Driver closed successfully")
             except Exception as e:
-                print(f"✗ Error closing driver: {str(e)}")
+                log(f"✗ Error closing driver: {str(e)}")
 
-    def take_screenshot(self, name):
-        """Take screenshot with timestamp"""
+    @step
+    def take_screenshot(self, name, keep=False):
+        """Take screenshot with timestamp; in on_failure mode only kept artifacts are written at once"""
         if self.driver:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             filename = f"{name}_{timestamp}.png"
             filepath = os.path.join(self.screenshots_dir, filename)
             try:
-                self.driver.save_screenshot(filepath)
-                print(f"✓ Screenshot saved: {filename}")
+                if SCREENSHOTS["mode"] == "on_failure" and not keep:
+                    self.screenshot_ring.push(filepath, self.driver.get_screenshot_as_base64())
+                    log(f"✓ Screenshot buffered: {filename}")
+                elif SCREENSHOTS["async"]:
+                    get_screenshot_pipeline().submit(filepath, self.driver.get_screenshot_as_base64())
+                    log(f"✓ Screenshot queued: {filename}")
+                    emit("artifact", kind="screenshot", path=filepath)
+                else:
+                    self.driver.save_screenshot(filepath)
+                    log(f"✓ Screenshot saved: {filename}")
+                    emit("artifact", kind="screenshot", path=filepath)
                 return filepath
             except Exception as e:
-                print(f"✗ Failed to take screenshot: {str(e)}")
+                log(f"✗ Failed to take screenshot: {str(e)}")
                 return None
 
-    def login(self):
-        """Perform login with test credentials"""
+    def dump_screenshot_ring(self):
+        """Write every buffered frame to disk (called when a step fails)"""
+        frames = self.screenshot_ring.drain()
+        for filepath, png_base64 in frames:
+            if SCREENSHOTS["async"]:
+                get_screenshot_pipeline().submit(filepath, png_base64)
+            else:
+                with open(filepath, 'wb') as f:
+                    f.write(base64.b64decode(png_base64))
+            emit("artifact", kind="screenshot", path=filepath)
+        if frames:
+            log(f"✓ {len(frames)} buffered screenshot(s) written after failure")
+
+    def step_failed(self, message):
+        """Report a failed step and keep the frames leading up to it"""
+        log(message)
+        self.dump_screenshot_ring()
+        return False
+
+    def device_key(self):
+        """Identify the device behind the current session for the login cache"""
+        capabilities = self.driver.capabilities or {}
+        for name in ("udid", "appium:udid", "deviceUDID", "deviceName", "appium:deviceName"):
+            if capabilities.get(name):
+                return capabilities[name]
+        return "default"
+
+    @step
+    def login(self, credentials=None):
+        """Log in (default: TEST_CREDENTIALS), skipping it when the device is already authenticated as that user"""
+        credentials = credentials or TEST_CREDENTIALS
+        if self.session and self.session.logged_in and self.session.username == credentials["username"]:
+            log("✓ Already logged in (pooled session)")
+            # The pool left the app on the home screen if it could, but the router detects it rather than assume it
+            self.screen = None
+            return True
+        
+        cached = LOGIN_CACHE.get(self.login_key(credentials))
+        if LOGIN_REUSE["enabled"] and cached and cached["logged_in"] and time.time() - cached["at"] < LOGIN_REUSE["ttl"]:
+            # The cache only says this user logged in on the device; a new session may still start logged out
+            if self.is_authenticated():
+                log(f"✓ Already logged in on this device (cached, saved ~{cached['duration']:.1f}s)")
+                self.screen = None
+                if self.session:
+                    self.session_pool.mark_logged_in(self.session, cached["duration"], credentials["username"])
+                return True
+            log("⚠️  Cached login no longer valid, logging in")
+        
+        login_start = time.time()
+        logged_in = self.perform_login(credentials)
+        self.record_login(logged_in, time.time() - login_start, credentials)
+        return logged_in
+
+    def login_key(self, credentials):
+        """Login cache key: the device and the user logged in on it"""
+        return self.device_key(), credentials["username"]
+
+    def record_login(self, logged_in, duration, credentials=None):
+        """Cache the login outcome and duration for this device and user"""
+        credentials = credentials or TEST_CREDENTIALS
+        LOGIN_CACHE[self.login_key(credentials)] = {
+            "logged_in": logged_in,
+            "duration": duration,
+            "at": time.time()
+        }
+        if logged_in:
+            self.screen = "home"
+            if self.session:
+                self.session_pool.mark_logged_in(self.session, duration, credentials["username"])
+
+    def is_authenticated(self):
+        """One zero-wait probe for an element only shown after login"""
+        return self.probe_selectors([HOME_SCREEN_MARKER]) is not None
+
+    @step
+    def perform_login(self, credentials=None):
+        """Fill in the login form unless the app is already authenticated"""
+        credentials = credentials or TEST_CREDENTIALS
         try:
-            print("Attempting to login...")
-            
-            # Wait for app to load
-            time.sleep(3)
+            log("Attempting to login...")
             
             # Look for login elements (adjust selectors based on actual app)
             username_selectors = [
@@ -88,54 +234,190 @@ class BaseTest:
                 (AppiumBy.XPATH, "//android.widget.Button[contains(@text, 'Login') or contains(@text, 'Sign In')]")
             ]
             
+            # Wait for app to load
+            self.wait_for_screen("app_load", 3, all_of(
+                spinner_gone(),
+                any_of(element_present(*username_selectors), element_present(HOME_SCREEN_MARKER))
+            ))
+            
+            # With noReset the app often starts logged in
+            if self.is_authenticated():
+                log("✓ Already authenticated, skipping login form")
+                return True
+            
             # Find and fill username
-            username_element = self.find_element_by_selectors(username_selectors)
+            username_element = self.find_element_by_selectors(username_selectors, "username")
             if username_element:
                 username_element.clear()
-                username_element.send_keys(TEST_CREDENTIALS["username"])
-                print("✓ Username entered")
+                username_element.send_keys(credentials["username"])
+                log("✓ Username entered")
             else:
-                print("✗ Username field not found")
+                log("✗ Username field not found")
                 return False
             
             # Find and fill password
-            password_element = self.find_element_by_selectors(password_selectors)
+            password_element = self.find_element_by_selectors(password_selectors, "password")
             if password_element:
                 password_element.clear()
-                password_element.send_keys(TEST_CREDENTIALS["password"])
-                print("✓ Password entered")
+                password_element.send_keys(credentials["password"])
+                log("✓ Password entered")
             else:
-                print("✗ Password field not found")
+                log("✗ Password field not found")
                 return False
             
             # Click login button
-            login_button = self.find_element_by_selectors(login_button_selectors)
+            login_button = self.find_element_by_selectors(login_button_selectors, "login_button")
             if login_button:
                 login_button.click()
-                print("✓ Login button clicked")
+                log("✓ Login button clicked")
                 
                 # Wait for login to complete
-                time.sleep(5)
+                self.wait_for_screen("login", 5, all_of(spinner_gone(), element_present(HOME_SCREEN_MARKER)))
                 
                 # Take screenshot after login
                 self.take_screenshot("after_login")
                 return True
             else:
-                print("✗ Login button not found")
+                log("✗ Login button not found")
                 return False
                 
         except Exception as e:
-            print(f"✗ Login failed: {str(e)}")
+            log(f"✗ Login failed: {str(e)}")
             return False
 
-    def find_element_by_selectors(self, selectors):
-        """Try multiple selectors to find an element"""
+    @step
+    def wait_for_screen(self, label, old_sleep, condition=None):
+        """Wait until the screen is ready, using the old fixed sleep as the budget"""
+        condition = condition or screen_settled()
+        # The screen is changing on its own, so only page sources fetched by the wait's polls describe it
+        if SNAPSHOT_CACHE["enabled"]:
+            snapshot_cache(self.driver).invalidate()
+        return ScreenWait(self.driver).until(condition, label, old_sleep)
+
+    def selector_key(self, name):
+        """Selector cache key for a logical element on the current screen"""
+        return f"{self.screen}.{name}" if name and self.selector_cache else None
+
+    @step
+    def find_element_by_selectors(self, selectors, name=None):
+        """Try multiple selectors to find an element; a named element found before on an identical screen is reused"""
+        if not (name and ELEMENT_CACHE["enabled"] and SELECTOR_LOOKUP["batched"] and snapshots_supported()):
+            return self.lookup_element(selectors, name)
+        
+        # The lookup needs this snapshot anyway, so fingerprinting the screen costs no round trip
+        fingerprint = self.get_hierarchy_snapshot().fingerprint()
+        key = (name, tuple(selectors))
+        cache = element_cache(self.driver)
+        element = cache.get(fingerprint, key)
+        if element is not None:
+            # The handle may outlive the flow that found it; re-resolve through this one
+            element.resolve = lambda: self.lookup_element(selectors, name)
+            return element
+        element = self.lookup_element(selectors, name)
+        if element is not None:
+            element = cache.put(fingerprint, key, element, lambda: self.lookup_element(selectors, name))
+        return element
+
+    def lookup_element(self, selectors, name=None):
+        """Try multiple selectors to find an element, learned winner first when named"""
+        key = self.selector_key(name)
+        if key:
+            selectors = self.selector_cache.order(key, selectors)
+        
+        start = time.time()
+        if SELECTOR_LOOKUP["batched"] and snapshots_supported():
+            element = self.find_element_by_snapshot(selectors, key)
+        else:
+            element = None
+            for by, value in selectors:
+                try:
+                    element = self.driver.find_element(by, value)
+                    if key:
+                        self.selector_cache.record_hit(key, (by, value))
+                    break
+                except NoSuchElementException:
+                    if key:
+                        self.selector_cache.record_miss(key, (by, value))
+        record_lookup(element is not None, time.time() - start)
+        return element
+
+    @step
+    def probe_selectors(self, selectors, name=None, timeout=0):
+        """Zero-wait lookup for optional elements: no implicit wait, one deadline for the whole chain"""
+        key = self.selector_key(name)
+        if key:
+            selectors = self.selector_cache.order(key, selectors)
+        
+        start = time.time()
+        deadline = start + timeout
+        element = None
+        self.driver.implicitly_wait(0)
+        try:
+            polls = 0
+            while True:
+                # Re-polls need a new snapshot; only the first look may come from the cache
+                element = self.probe_once(selectors, key, fresh=polls > 0)
+                polls += 1
+                remaining = deadline - time.time()
+                if element is not None or remaining <= 0:
+                    break
+                time.sleep(min(SELECTOR_LOOKUP["poll_interval"], remaining))
+        finally:
+            self.driver.implicitly_wait(TIMEOUTS["implicit_wait"])
+        record_lookup(element is not None, time.time() - start)
+        return element
+
+    def probe_once(self, selectors, key=None, fresh=False):
+        """Single pass over a selector chain using find_elements (never raises on a miss)"""
+        candidates = selectors
+        if SELECTOR_LOOKUP["batched"] and snapshots_supported():
+            snapshot = self.get_hierarchy_snapshot(fresh)
+            candidates = [selector for selector in selectors if snapshot.matches(*selector) is not False]
+        
+        # Optional elements are often legitimately absent, so misses only count when another selector hit
+        missed = []
         for by, value in selectors:
-            try:
-                element = self.driver.find_element(by, value)
-                return element
-            except NoSuchElementException:
-                continue
+            if (by, value) in candidates:
+                elements = self.driver.find_elements(by, value)
+                if elements:
+                    if key:
+                        for selector in missed:
+                            self.selector_cache.record_miss(key, selector)
+                        self.selector_cache.record_hit(key, (by, value))
+                    return elements[0]
+            missed.append((by, value))
+        return None
+
+    def get_hierarchy_snapshot(self, fresh=False):
+        """Parsed UI hierarchy: the cached snapshot while the screen is unchanged, else one round trip"""
+        if SNAPSHOT_CACHE["enabled"]:
+            return snapshot_cache(self.driver).get(ANDROID_CAPABILITIES.get("appPackage"), fresh)
+        return HierarchySnapshot(self.driver.page_source, ANDROID_CAPABILITIES.get("appPackage"))
+
+    def find_element_by_snapshot(self, selectors, key=None):
+        """Evaluate every selector against one hierarchy snapshot, then fetch only the winner"""
+        deadline = time.time() + TIMEOUTS["implicit_wait"]
+        polls = 0
+        while True:
+            snapshot = self.get_hierarchy_snapshot(fresh=polls > 0)
+            polls += 1
+            # None means the selector can't be evaluated locally, so let the server decide
+            candidates = [selector for selector in selectors if snapshot.matches(*selector) is not False]
+            if candidates or time.time() >= deadline:
+                break
+            time.sleep(SELECTOR_LOOKUP["poll_interval"])
+        
+        for by, value in selectors:
+            if (by, value) in candidates:
+                try:
+                    element = self.driver.find_element(by, value)
+                    if key:
+                        self.selector_cache.record_hit(key, (by, value))
+                    return element
+                except NoSuchElementException:
+                    pass
+            if key:
+                self.selector_cache.record_miss(key, (by, value))
         return None
 
     def wait_and_click(self, by, value, timeout=None):
@@ -148,7 +430,7 @@ class BaseTest:
             element.click()
             return True
         except TimeoutException:
-            print(f"✗ Element not clickable: {value}")
+            log(f"✗ Element not clickable: {value}")
             return False
 
     def wait_and_send_keys(self, by, value, text, timeout=None):
@@ -162,33 +444,89 @@ class BaseTest:
             element.send_keys(text)
             return True
         except TimeoutException:
-            print(f"✗ Element not found: {value}")
+            log(f"✗ Element not found: {value}")
             return False
 
-    def navigate_to_hr_section(self):
-        """Navigate to HR section"""
-        try:
-            print("Navigating to HR section...")
-            
-            # Common selectors for HR navigation
-            hr_selectors = [
-                (AppiumBy.XPATH, "//android.widget.TextView[contains(@text, 'HR')]"),
-                (AppiumBy.XPATH, "//android.widget.Button[contains(@text, 'HR')]"),
-                (AppiumBy.ID, "hr_menu"),
-                (AppiumBy.ID, "hr_section"),
-                (AppiumBy.XPATH, "//android.widget.ImageView[contains(@content-desc, 'HR')]")
-            ]
-            
-            hr_element = self.find_element_by_selectors(hr_selectors)
-            if hr_element:
-                hr_element.click()
-                time.sleep(2)
-                print("✓ Navigated to HR section")
+    def current_screen(self):
+        """Screen the app is showing, recognised from the hierarchy (None if it isn't a known screen)"""
+        detected = {}
+
+        def recognised(driver):
+            detected["screen"] = detect_screen(driver)
+            return detected["screen"] is not None
+
+        # A screen mid-transition shows only a spinner, so give it a moment to settle
+        self.wait_for_screen("current_screen", 2, recognised)
+        return detected.get("screen")
+
+    @step
+    def navigate_to(self, target):
+        """Open target directly if the navigation backend can, else take the cheapest menu route to it"""
+        if self.screen == target:
+            return True
+        if NAVIGATION["backend"] != "menu" and self.open_directly(target):
+            return True
+        
+        source = self.screen if self.screen in SCREENS else self.current_screen()
+        failed = set()
+        while True:
+            if source is None:
+                log(f"✗ Current screen not recognised, cannot navigate to {target}")
+                return False
+            route = shortest_route(source, target, failed)
+            if route is None:
+                log(f"✗ No route from {source} to {target}")
+                return False
+            for edge in route:
+                if not self.take_route_edge(edge):
+                    # Re-plan from wherever the app actually is, without the edge that let us down
+                    failed.add(edge)
+                    source = self.current_screen()
+                    break
+                source = edge[1]
+            else:
                 return True
+
+    def open_directly(self, target):
+        """Jump to target by deep link or activity; True only once the target screen is showing"""
+        backend = NAVIGATION["backend"]
+        app_package = ANDROID_CAPABILITIES.get("appPackage")
+        try:
+            if backend == "deep_link" and target in NAVIGATION["deep_links"]:
+                self.driver.execute_script("mobile: deepLink", {
+                    "url": NAVIGATION["deep_links"][target], "package": app_package
+                })
+            elif backend == "activity" and target in NAVIGATION["activities"]:
+                self.driver.execute_script("mobile: startActivity", {
+                    "intent": f"{app_package}/{NAVIGATION['activities'][target]}"
+                })
             else:
-                print("✗ HR section not found")
                 return False
-                
-        except Exception as e:
-            print(f"✗ Failed to navigate to HR: {str(e)}")
+        except WebDriverException as e:
+            log(f"⚠️  {backend} to {target} failed ({e.msg}), using menu navigation")
+            return False
+        
+        # The app may ignore the link or show something else (e.g. the login screen)
+        self.screen = None
+        if not self.wait_for_screen(f"{target}_screen", ARRIVAL_BUDGETS.get(target, 3), screen_shown(target)):
+            log(f"⚠️  {backend} did not land on {target}, using menu navigation")
+            return False
+        self.screen = target
+        log(f"✓ Opened {target} via {backend}")
+        return True
+
+    def take_route_edge(self, edge):
+        """Tap a menu entry or press back, then wait until the expected screen is showing"""
+        start, end, action = edge
+        self.screen = start
+        if action[0] == "tap":
+            element = self.find_element_by_selectors(MENU_SELECTORS[action[1]], action[1])
+            if not element:
+                return False
+            element.click()
+        else:
+            self.driver.back()
+        if not self.wait_for_screen(f"{end}_screen", ARRIVAL_BUDGETS.get(end, 3), screen_shown(end)):
             return False
+        self.screen = end
+        return True
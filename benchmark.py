@@ -0,0 +1,208 @@
+"""
+Benchmark suite for framework overhead per flow and per step
+Runs the real flows repeatedly against the local fake Appium server and writes JSON results
+
+Usage:
+    python benchmark.py [--iterations 10] [--latency 20] [--transition 0] [--no-pool] [--navigation deep_link]
+                        [--output benchmark_results.json] [--compare baseline.json] [--verbose]
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import subprocess
+import threading
+import time
+from datetime import datetime
+from fake_appium_server import start_server
+from instrumentation import add_listener, remove_listener, summarize
+from parallel_runner import FLOWS
+from session_pool import SessionPool
+from events import get_event_bus, flush_events
+from config import NAVIGATION
+
+
+class BenchmarkRecorder:
+    """Collects step wall times and WebDriver command latencies for one flow run"""
+
+    def __init__(self):
+        self.local = threading.local()
+        self.steps = {}
+        self.step_commands = {}
+        self.commands = {}
+
+    def stack(self):
+        if not hasattr(self.local, "stack"):
+            self.local.stack = []
+        return self.local.stack
+
+    def step_started(self, name, start):
+        self.stack().append(name)
+
+    def step_finished(self, name, start, end, outcome):
+        self.stack().pop()
+        self.steps.setdefault(name, []).append(end - start)
+
+    def command_finished(self, command, start, end):
+        self.commands.setdefault(command, []).append(end - start)
+        # Steps nest, so a command counts towards every step that is open (inclusive counts)
+        for name in set(self.stack()):
+            self.step_commands[name] = self.step_commands.get(name, 0) + 1
+
+
+def run_flow(flow_name, session_pool, verbose=False):
+    """Run one flow under a fresh recorder and return (passed, duration, recorder)"""
+    recorder = BenchmarkRecorder()
+    add_listener(recorder)
+    output = contextlib.nullcontext() if verbose else contextlib.redirect_stdout(io.StringIO())
+    start = time.perf_counter()
+    try:
+        with output:
+            passed = bool(FLOWS[flow_name](session_pool))
+    finally:
+        remove_listener(recorder)
+    return passed, time.perf_counter() - start, recorder
+
+
+def run_benchmark(flow_names=None, iterations=10, latency=0.0, transition=0.0, pooled=True, verbose=False,
+                  navigation=None):
+    """Run every flow `iterations` times and aggregate the measurements"""
+    flow_names = flow_names or list(FLOWS)
+    if navigation:
+        NAVIGATION["backend"] = navigation
+    server = start_server(latency=latency, transition=transition)
+    # max_uses=1 evicts every session on release, which is the same as not pooling
+    session_pool = SessionPool(server.url, settings=None if pooled else {"max_uses": 1})
+
+    # Flow output goes nowhere unless asked for, and no report files are written
+    get_event_bus(["console"] if verbose else [])
+
+    runs = {name: [] for name in flow_names}
+    try:
+        for iteration in range(iterations):
+            # Each iteration checks in and applies for the same dates again
+            server.app.reset()
+            for flow_name in flow_names:
+                passed, duration, recorder = run_flow(flow_name, session_pool, verbose)
+                runs[flow_name].append((passed, duration, recorder))
+                flush_events()
+                print(f"{'✓' if passed else '✗'} {flow_name} #{iteration + 1}: {duration:.2f}s, "
+                      f"{sum(len(values) for values in recorder.commands.values())} commands")
+    finally:
+        session_pool.close()
+        server.shutdown()
+        server.server_close()
+
+    flows = {}
+    for flow_name, flow_runs in runs.items():
+        steps, step_commands, commands = {}, {}, {}
+        for _, _, recorder in flow_runs:
+            for name, values in recorder.steps.items():
+                steps.setdefault(name, []).extend(values)
+            for name, count in recorder.step_commands.items():
+                step_commands[name] = step_commands.get(name, 0) + count
+            for name, values in recorder.commands.items():
+                commands.setdefault(name, []).extend(values)
+
+        all_commands = [value for values in commands.values() for value in values]
+        flows[flow_name] = {
+            "passed": sum(1 for passed, _, _ in flow_runs if passed),
+            "runs": len(flow_runs),
+            "wall_time": summarize([duration for _, duration, _ in flow_runs]),
+            "commands_per_run": len(all_commands) / len(flow_runs),
+            "command_latency": summarize(all_commands),
+            "commands": {name: summarize(values) for name, values in sorted(commands.items())},
+            "steps": {
+                name: dict(summarize(values), commands_per_call=step_commands.get(name, 0) / len(values))
+                for name, values in steps.items()
+            }
+        }
+
+    return {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "commit": current_commit(),
+        "settings": {
+            "iterations": iterations,
+            "latency": latency,
+            "transition": transition,
+            "pooled": pooled,
+            "navigation": NAVIGATION["backend"]
+        },
+        "flows": flows
+    }
+
+
+def current_commit():
+    """Short hash of the checked-out commit, so results can be compared between commits"""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_results(results, baseline=None):
+    """Print per-flow and per-step tables, with p50 deltas against a baseline if given"""
+    for flow_name, flow in results["flows"].items():
+        base_flow = (baseline or {}).get("flows", {}).get(flow_name, {})
+        wall = flow["wall_time"]
+        print()
+        print(f"{flow_name}: {flow['passed']}/{flow['runs']} passed, "
+              f"{flow['commands_per_run']:.0f} commands/run")
+        print(f"Wall time p50 {wall['p50']:.3f}s  p95 {wall['p95']:.3f}s  p99 {wall['p99']:.3f}s"
+              f"{delta(wall['p50'], base_flow.get('wall_time', {}).get('p50'))}")
+        latency = flow["command_latency"]
+        print(f"Command latency p50 {latency['p50'] * 1000:.1f}ms  p95 {latency['p95'] * 1000:.1f}ms  "
+              f"p99 {latency['p99'] * 1000:.1f}ms")
+        print("-" * 80)
+        print(f"{'Step':<36}{'calls':>7}{'cmds/call':>11}{'p50':>9}{'p95':>9}{'p99':>9}")
+        steps = sorted(flow["steps"].items(), key=lambda item: item[1]["total"], reverse=True)
+        for name, stats in steps:
+            base_step = base_flow.get("steps", {}).get(name, {})
+            print(f"{name:<36}{stats['count']:>7}{stats['commands_per_call']:>11.1f}"
+                  f"{stats['p50']:>8.3f}s{stats['p95']:>8.3f}s{stats['p99']:>8.3f}s"
+                  f"{delta(stats['p50'], base_step.get('p50'))}")
+        print("-" * 80)
+
+
+def delta(value, baseline_value):
+    """Percentage change against a baseline value, or nothing without one"""
+    if not baseline_value:
+        return ""
+    return f"  ({(value - baseline_value) / baseline_value * 100:+.0f}%)"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the automation flows against the fake Appium server")
+    parser.add_argument("--flows", nargs="+", choices=list(FLOWS), help="Flows to run (default: all)")
+    parser.add_argument("--iterations", type=int, default=10)
+    parser.add_argument("--latency", type=float, default=20.0, help="Per-command server latency in milliseconds")
+    parser.add_argument("--transition", type=float, default=0.0, help="Screen transition time in milliseconds")
+    parser.add_argument("--no-pool", action="store_true", help="Open a new session for every flow run")
+    parser.add_argument("--navigation", choices=["menu", "deep_link", "activity"],
+                        help="Screen navigation backend (default: config.NAVIGATION)")
+    parser.add_argument("--output", default="benchmark_results.json")
+    parser.add_argument("--compare", help="Earlier results file to compare p50 times against")
+    parser.add_argument("--verbose", action="store_true", help="Show the flows' own output")
+    args = parser.parse_args()
+
+    results = run_benchmark(
+        args.flows, args.iterations, args.latency / 1000.0, args.transition / 1000.0,
+        pooled=not args.no_pool, verbose=args.verbose, navigation=args.navigation
+    )
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+    print_results(results, baseline)
+
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"\n✓ Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
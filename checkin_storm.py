@@ -0,0 +1,184 @@
+"""
+Morning check-in storm simulation
+Replays an arrival curve of employees checking in, each on a freshly reset app with their own
+credentials, and reports tap-to-confirmation latency and Already Checked In rates per load window,
+with session setup and login timed separately (they take far longer than the check-in on a real device)
+
+Usage:
+    python checkin_storm.py [--sessions 8] [--scale 1.0] [--credentials employees.csv] [--server URL]
+    python checkin_storm.py --fake [--latency 20] [--transition 0]    # in-process fake Appium server
+"""
+
+import argparse
+import csv
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from config import APPIUM_SERVER_URL, ANDROID_CAPABILITIES, CHECKIN_STORM
+from connection_pool import reserve_connections
+from instrumentation import summarize
+from load_harness import add_harness_arguments, run_load
+from load_schedule import ArrivalSchedule, curve_arrivals
+from session_pool import SessionPool
+from events import set_event_context, emit
+from test_checkin_leave import CheckInLeaveTest
+
+
+def storm_credentials(path=None, settings=None):
+    """Credential sets from a username,password CSV, or generated from the storm settings"""
+    settings = settings or CHECKIN_STORM
+    if path:
+        with open(path, newline="") as f:
+            return [{"username": row["username"], "password": row["password"]} for row in csv.DictReader(f)]
+    return [
+        {"username": settings["username_template"].format(index=index), "password": settings["password"]}
+        for index in range(settings["users"])
+    ]
+
+
+def storm_worker(session_pool, schedule, arrivals, credentials):
+    """Serve arrivals from the shared schedule until it runs out"""
+    results = []
+    while True:
+        slot = schedule.take()
+        if slot is None:
+            break
+        index, due = slot
+        time.sleep(max(0.0, due - time.perf_counter()))
+        results.append(check_in_arrival(session_pool, index, due - schedule.start, credentials[arrivals[index]],
+                                        time.perf_counter() - due))
+    return results
+
+
+def check_in_arrival(session_pool, index, offset, credentials, lag):
+    """One employee opening the app, logging in and tapping Check In"""
+    set_event_context(flow="checkin_storm", user=credentials["username"])
+    test = CheckInLeaveTest(session_pool)
+    result = {
+        "index": index,
+        "offset": offset,
+        "user": credentials["username"],
+        "lag": lag,
+        "outcome": "error",
+        "latency": None,
+        "setup": None,
+        "login": None
+    }
+    start = time.perf_counter()
+    try:
+        # A new session and a cold app start dwarf the check-in itself, so they are timed apart from it
+        if test.setup_driver():
+            result["setup"] = time.perf_counter() - start
+            # The app was reset, so the login form is always shown; the per-device login cache does not apply
+            if test.perform_login(credentials) and test.navigate_to_checkin():
+                result["login"] = time.perf_counter() - start - result["setup"]
+                test.complete_checkin()
+                result["outcome"] = test.checkin_outcome or "failed"
+                result["latency"] = test.checkin_latency
+    except Exception as e:
+        result["error"] = str(e)
+    finally:
+        test.teardown_driver()
+    result["duration"] = time.perf_counter() - start
+    emit("checkin", **result)
+    set_event_context()
+    return result
+
+
+def run_checkin_storm(server_url=APPIUM_SERVER_URL, credentials=None, settings=None, scale=1.0):
+    """Replay the arrival curve across settings["sessions"] sessions and return the per-arrival results"""
+    settings = dict(CHECKIN_STORM, **(settings or {}))
+    reserve_connections(settings["sessions"])
+    credentials = credentials or storm_credentials(settings=settings)
+    offsets = curve_arrivals(settings["arrival_curve"], scale)
+    rng = random.Random(settings["seed"])
+    arrivals = [rng.randrange(len(credentials)) for _ in offsets]
+
+    # A session per arrival with the app reset: max_uses=1 quits every session when it is released
+    capabilities = dict(ANDROID_CAPABILITIES, noReset=False)
+    session_pool = SessionPool(server_url, capabilities, settings={"max_uses": 1})
+    schedule = ArrivalSchedule(offsets)
+    results = []
+    try:
+        with ThreadPoolExecutor(max_workers=settings["sessions"], thread_name_prefix="storm") as executor:
+            schedule.begin()
+            futures = [
+                executor.submit(storm_worker, session_pool, schedule, arrivals, credentials)
+                for _ in range(settings["sessions"])
+            ]
+            for future in futures:
+                results.extend(future.result())
+    finally:
+        session_pool.close()
+    return sorted(results, key=lambda result: result["index"])
+
+
+def storm_report(results, settings=None):
+    """Overall and per-window tap-to-confirmation latency, Already Checked In and error rates"""
+    settings = dict(CHECKIN_STORM, **(settings or {}))
+    width = settings["bucket_seconds"]
+    windows = {}
+    for result in results:
+        windows.setdefault(int(result["offset"] // width), []).append(result)
+
+    def window_stats(window_results):
+        tapped = [result["latency"] for result in window_results if result["latency"] is not None]
+        count = len(window_results)
+        return {
+            "arrivals": count,
+            "latency": summarize(tapped),
+            "setup_p95": summarize([r["setup"] for r in window_results if r["setup"] is not None])["p95"],
+            "login_p95": summarize([r["login"] for r in window_results if r["login"] is not None])["p95"],
+            "already_rate": sum(1 for r in window_results if r["outcome"] == "already_checked_in") / count,
+            "error_rate": sum(1 for r in window_results if r["outcome"] in ("error", "failed")) / count,
+            "lag_p95": summarize([result["lag"] for result in window_results])["p95"]
+        }
+
+    return {
+        "sessions": settings["sessions"],
+        "bucket_seconds": width,
+        "total": window_stats(results) if results else None,
+        "windows": {index * width: window_stats(window) for index, window in sorted(windows.items())}
+    }
+
+
+def print_storm_report(report):
+    """Print the storm summary and one row per load window
+
+    p50/p95/p99 are tap-to-confirmation; session setup (new session and cold app start) and
+    login (login form and navigation to Check-IN) are shown as their own p95 columns.
+    """
+    print("Check-IN Storm:")
+    print("-" * 108)
+    print(f"{'Window':<10}{'arrivals':>9}{'rate/s':>8}{'p50':>9}{'p95':>9}{'p99':>9}"
+          f"{'already':>10}{'errors':>9}{'setup p95':>11}{'login p95':>11}{'lag p95':>10}")
+    rows = list(report["windows"].items())
+    if report["total"]:
+        rows.append(("total", report["total"]))
+    for window, stats in rows:
+        latency = stats["latency"]
+        label = f"{window}s" if window != "total" else window
+        rate = f"{stats['arrivals'] / report['bucket_seconds']:.1f}" if window != "total" else ""
+        print(f"{label:<10}{stats['arrivals']:>9}{rate:>8}{latency['p50']:>8.3f}s{latency['p95']:>8.3f}s"
+              f"{latency['p99']:>8.3f}s{stats['already_rate'] * 100:>9.1f}%{stats['error_rate'] * 100:>8.1f}%"
+              f"{stats['setup_p95']:>10.2f}s{stats['login_p95']:>10.2f}s{stats['lag_p95']:>9.2f}s")
+    print("-" * 108)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulate the morning check-in storm")
+    parser.add_argument("--sessions", type=int, default=CHECKIN_STORM["sessions"])
+    parser.add_argument("--scale", type=float, default=1.0, help="Multiply every rate on the arrival curve")
+    parser.add_argument("--credentials", help="CSV file with username,password columns (default: generated users)")
+    add_harness_arguments(parser)
+    args = parser.parse_args()
+
+    settings = {"sessions": args.sessions}
+    credentials = storm_credentials(args.credentials)
+    results = run_load(args, lambda server_url: run_checkin_storm(server_url, credentials, settings, args.scale))
+
+    print_storm_report(storm_report(results, settings))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""
+WebDriver command budget profiler
+Counts commands by type for every flow step and checks them against per-step budgets
+"""
+
+import threading
+from config import COMMAND_BUDGETS
+from instrumentation import add_listener, remove_listener
+from events import log
+
+# WebDriver command name -> reporting category; anything unlisted is "other"
+COMMAND_CATEGORIES = {
+    "findElement": "find",
+    "findElements": "find",
+    "findChildElement": "find",
+    "findChildElements": "find",
+    "clickElement": "click",
+    "sendKeysToElement": "send_keys",
+    "clearElement": "clear",
+    "screenshot": "screenshot",
+    "elementScreenshot": "screenshot",
+    "getPageSource": "source",
+    "w3cExecuteScript": "execute",
+    "setTimeouts": "timeouts",
+    "goBack": "back"
+}
+CATEGORIES = ["find", "click", "send_keys", "clear", "screenshot", "source", "execute", "timeouts", "back", "other"]
+
+
+class CommandBudgetExceeded(AssertionError):
+    """A step issued more WebDriver commands than its budget allows"""
+
+
+class CommandProfiler:
+    """Per-step command counts and times; commands count towards every open step"""
+
+    def __init__(self, budgets=None, mode=None, polling_steps=None):
+        self.budgets = COMMAND_BUDGETS["steps"] if budgets is None else budgets
+        self.mode = mode or COMMAND_BUDGETS["mode"]
+        self.polling_steps = set(COMMAND_BUDGETS["polling_steps"] if polling_steps is None else polling_steps)
+        self.local = threading.local()
+        self.lock = threading.Lock()
+        self.steps = {}
+        self.violations = []
+
+    def stack(self):
+        if not hasattr(self.local, "stack"):
+            self.local.stack = []
+        return self.local.stack
+
+    def step_started(self, name, start):
+        self.stack().append({"name": name, "counts": {}})
+
+    def command_finished(self, command, start, end):
+        stack = self.stack()
+        category = COMMAND_CATEGORIES.get(command, "other")
+        polling = False
+        for frame in reversed(stack):
+            # Polls inside a screen wait depend on how fast the app is, so they're kept out of budgets
+            if polling:
+                frame["counts"]["polling"] = frame["counts"].get("polling", 0) + 1
+            else:
+                frame["counts"][category] = frame["counts"].get(category, 0) + 1
+            polling = polling or frame["name"] in self.polling_steps
+
+    def step_finished(self, name, start, end, outcome):
+        frame = self.stack().pop()
+        counts = frame["counts"]
+        total = sum(count for category, count in counts.items() if category != "polling")
+        with self.lock:
+            stats = self.steps.setdefault(name, {"calls": 0, "total": 0, "max": 0, "time": 0.0, "counts": {}})
+            stats["calls"] += 1
+            stats["total"] += total
+            stats["max"] = max(stats["max"], total)
+            stats["time"] += end - start
+            for category, count in counts.items():
+                stats["counts"][category] = stats["counts"].get(category, 0) + count
+        self.check_budget(name, total, counts)
+
+    def check_budget(self, name, total, counts):
+        """Warn about, or fail, a step call that went over budget"""
+        budget = self.budgets.get(name)
+        if budget is None:
+            return
+        limits = budget if isinstance(budget, dict) else {"total": budget}
+        for category, limit in limits.items():
+            used = total if category == "total" else counts.get(category, 0)
+            if used > limit:
+                message = f"{name}: {used} {category} commands (budget {limit})"
+                with self.lock:
+                    self.violations.append(message)
+                if self.mode == "fail":
+                    raise CommandBudgetExceeded(message)
+                log(f"⚠️  Command budget exceeded: {message}")
+
+    def start(self):
+        add_listener(self)
+        return self
+
+    def stop(self):
+        remove_listener(self)
+
+    def print_report(self):
+        """Per-step command counts by category against the declared budgets"""
+        print("Command Budgets:")
+        print("-" * 110)
+        columns = ["find", "click", "send_keys", "screenshot", "source"]
+        header = f"{'Step':<36}{'calls':>6}{'avg':>6}{'max':>6}{'budget':>8}{'time':>9}"
+        header += "".join(f"{column:>11}" for column in columns) + f"{'other':>7}{'polls':>7}"
+        print(header)
+        for name, stats in sorted(self.steps.items(), key=lambda item: item[1]["total"], reverse=True):
+            budget = self.budgets.get(name)
+            if isinstance(budget, dict):
+                budget = budget.get("total", "*")
+            calls = stats["calls"]
+            counts = stats["counts"]
+            other = sum(counts.get(category, 0) for category in CATEGORIES if category not in columns)
+            flag = " ⚠️" if budget is not None and budget != "*" and stats["max"] > budget else ""
+            row = f"{name:<36}{calls:>6}{stats['total'] / calls:>6.1f}{stats['max']:>6}"
+            row += f"{budget if budget is not None else '-':>8}{stats['time'] / calls:>8.2f}s"
+            row += "".join(f"{counts.get(column, 0) / calls:>11.1f}" for column in columns)
+            row += f"{other / calls:>7.1f}{counts.get('polling', 0) / calls:>7.1f}{flag}"
+            print(row)
+        print("-" * 110)
+        print(f"Budget violations: {len(self.violations)}")
+        for message in self.violations:
+            print(f"  ✗ {message}")
+        print("-" * 110)
+
+
+def start_profiler():
+    """Start a command profiler if budgets are enabled, else return None"""
+    return CommandProfiler().start() if COMMAND_BUDGETS["enabled"] else None
@@ -2,6 +2,8 @@
 Configuration file for Appium automation tests
 """
 
+import os
+
 # Appium Server Configuration
 APPIUM_SERVER_URL = "http://localhost:4723"
 
@@ -53,9 +55,207 @@ TEST_DATA = {
     }
 }
 
+# Attendance Search Sweep (many date windows x statuses in one logged-in session)
+ATTENDANCE_SWEEP = {
+    "start": "01/01/2024",      # First From Date
+    "end": "31/12/2024",        # No window ends after this
+    "window_days": [7, 14, 30], # Window lengths; every window is kept within one month
+    "step_days": 30,            # From Date advance between windows
+    "statuses": ["On Leave", "Present", "Late", "Absent", "All"],
+    "max_queries": 100
+}
+
+# Leave Application Load (concurrent sessions submitting applications at a target rate)
+LEAVE_LOAD = {
+    "sessions": 4,              # Concurrent virtual users, one Appium session each
+    "rate": 2.0,                # Target submissions per second across all sessions (0 = as fast as possible)
+    "applications": 40,         # Total applications to submit
+    "start_date": "01/03/2024", # First leave day; every application gets its own date range after it
+    "days": 1,                  # Leave days per application
+    "gap_days": 1,              # Free days between consecutive date ranges
+    "leave_type": "Annual Leave",
+    "reason": "Load test"
+}
+
+# Morning Check-IN Storm (arrivals follow a rate curve; each arrival is one employee on a freshly reset app)
+CHECKIN_STORM = {
+    "sessions": 8,              # Concurrent device sessions serving arrivals
+    "arrival_curve": [[0, 0.5], [20, 2.0], [40, 4.0], [60, 1.0]],  # (second, check-ins per second) points
+    "bucket_seconds": 10,       # Report window for latency and Already Checked In rates
+    "users": 100,               # Employees arrivals are drawn from (generated unless a credentials CSV is given)
+    "username_template": "employee{index:04d}@abccompany.com",
+    "password": TEST_CREDENTIALS["password"],
+    "seed": 9                   # Which employee arrives when is random but repeatable
+}
+
 # Timeouts
 TIMEOUTS = {
     "implicit_wait": 10,
     "explicit_wait": 20,
     "page_load": 30
 }
+
+# Session Pool (reuse logged-in Appium sessions across test flows)
+SESSION_POOL = {
+    "enabled": True,
+    "max_idle_seconds": 300,    # Evict sessions idle for longer than this
+    "max_session_age": 1800,    # Evict sessions older than this
+    "max_uses": 20,             # Evict sessions after this many borrows
+    "reset_back_presses": 4,    # Back presses allowed when resetting to the home screen
+    "reset_settle_seconds": 1.0 # Time a screen gets to be recognised after each back press
+}
+
+# Device Pool (parallel execution, one driver per worker process)
+DEVICE_POOL = [
+    {
+        "name": "emulator-5554",
+        "server_url": "http://localhost:4723",
+        "udid": "emulator-5554",
+        "systemPort": 8200
+    },
+    {
+        "name": "emulator-5556",
+        "server_url": "http://localhost:4725",
+        "udid": "emulator-5556",
+        "systemPort": 8201
+    }
+]
+
+# Screen-Ready Waits (replace fixed sleeps; the old sleep is the wait budget)
+WAITS = {
+    "initial_poll": 0.05,       # First poll interval in seconds
+    "max_poll": 0.5,            # Poll interval ceiling
+    "poll_backoff": 1.5,        # Poll interval growth per attempt
+    "timeout_factor": 1.0,      # Timeout as a multiple of the old sleep budget
+    "spinner_xpath": "//android.widget.ProgressBar"
+}
+
+# Hierarchy Snapshot Cache (lookups reuse the last page source until a click, send_keys, clear,
+# back or script changes the screen, or the TTL runs out)
+SNAPSHOT_CACHE = {
+    "enabled": True,
+    "ttl": 1.0                  # Seconds a snapshot is trusted without any action (the app can change on its own)
+}
+
+# Element Handle Cache (named elements are reused whenever the hierarchy snapshot has the same
+# fingerprint as where they were found; a handle the server reports stale is looked up again)
+ELEMENT_CACHE = {
+    "enabled": True,
+    "max_screens": 16           # Screen fingerprints whose handles are kept per driver
+}
+
+# Screen Navigation ("menu" routes through menu taps and back presses; "deep_link" and "activity"
+# open a screen directly and fall back to the menu when it doesn't land on the expected screen)
+NAVIGATION = {
+    "backend": os.environ.get("HR_NAVIGATION", "menu"),    # Per run: HR_NAVIGATION=deep_link python test_runner.py
+    "deep_links": {
+        "home": "abccompany://home",
+        "hr": "abccompany://hr",
+        "my_attendance": "abccompany://hr/attendance",
+        "checkin": "abccompany://hr/checkin",
+        "leave_application": "abccompany://hr/leave"
+    },
+    "activities": {             # Relative to appPackage
+        "home": ".MainActivity",
+        "hr": ".hr.HRActivity",
+        "my_attendance": ".hr.MyAttendanceActivity",
+        "checkin": ".hr.CheckInActivity",
+        "leave_application": ".hr.LeaveApplicationActivity"
+    }
+}
+
+# Learned Selector Cache (persisted across runs)
+SELECTOR_CACHE = {
+    "enabled": True,
+    "path": ".selector_cache.json",
+    "max_misses": 3             # Consecutive misses before a learned selector is evicted
+}
+
+# Selector Lookup (batched: evaluate all candidates against one page-source snapshot)
+SELECTOR_LOOKUP = {
+    "batched": True,
+    "poll_interval": 0.25       # Snapshot re-poll interval while no candidate matches
+}
+
+# Search Results Extraction (scroll the result list a page at a time, one snapshot per page)
+RESULTS_EXTRACTION = {
+    "list_xpath": "//android.widget.RecyclerView | //androidx.recyclerview.widget.RecyclerView | //android.widget.ListView",
+    "row_xpath": "./*",         # Rows, relative to the list
+    "fields": {                 # Record field -> attribute XPath, relative to the row
+        "date": ".//*[contains(@resource-id, 'record_date')]/@text",
+        "status": ".//*[contains(@resource-id, 'record_status')]/@text"
+    },
+    "scroll_percent": 0.8,      # Page size as a fraction of the list; below 1.0 windows overlap
+    "max_pages": 50
+}
+
+# Login Reuse (skip the login form on devices that are already authenticated)
+LOGIN_REUSE = {
+    "enabled": True,
+    "ttl": 1800                 # Seconds a cached login is trusted without probing
+}
+
+# Screenshots (async: write frames on background threads;
+# mode "on_failure": keep step frames in a ring buffer, write them only when a step fails)
+SCREENSHOTS = {
+    "mode": "always",           # "always" or "on_failure"
+    "ring_frames": 10,          # Frames kept in the ring buffer
+    "ring_max_bytes": 20 * 1024 * 1024,
+    "async": True,
+    "writer_threads": 2,
+    "queue_size": 8,            # Frames held in memory before take_screenshot blocks
+    "reencode": False           # Re-encode PNGs with maximum compression (needs Pillow)
+}
+
+# Step Tracing (Chrome/Perfetto trace JSON per run; open in ui.perfetto.dev or chrome://tracing)
+TRACING = {
+    "enabled": False,
+    "output_dir": "../traces"
+}
+
+# HTTP Connection Pool (one keep-alive urllib3 pool shared by every driver in the process)
+HTTP_POOL = {
+    "enabled": True,
+    "max_hosts": 10,            # Appium servers with a cached connection pool
+    "per_host": 8,              # Keep-alive connections kept per server
+    "block": True,              # Wait for a free connection instead of opening extra ones
+    "connect_timeout": 10,
+    "read_timeout": 120,        # Long enough for session creation and slow commands
+    "retries": 0                # WebDriver commands are not idempotent, so never retry
+}
+
+# WebDriver Command Budgets (max commands per step call; polls inside screen waits are not counted)
+# A budget is a total, or a dict of limits per category ("total", "find", "click", "send_keys", ...)
+COMMAND_BUDGETS = {
+    "enabled": True,
+    "mode": "warn",             # "warn" prints the overrun, "fail" raises and fails the step
+    "polling_steps": ["wait_for_screen"],
+    "steps": {
+        "find_element_by_selectors": 2,     # One page source, then one find for the winner
+        "probe_selectors": {"total": 4, "find": 1},
+        "take_screenshot": 1,
+        "perform_login": 16,
+        "navigate_to_my_attendance": 7,
+        "input_date_range": 8,
+        "filter_by_status": 6,
+        "validate_search_results": 12,
+        "navigate_to_checkin": 7,
+        "complete_checkin": 10,
+        "navigate_to_leave_application": 7,
+        "fill_leave_type": 8,
+        "fill_leave_from_date": 4,
+        "fill_leave_to_date": 4,
+        "fill_leave_reason": 4,
+        "submit_leave_application": 7
+    }
+}
+
+# Event Bus (structured step/flow events written to sinks on a background thread)
+EVENTS = {
+    "enabled": True,
+    "sinks": ["console", "jsonl", "junit"],   # Any of "console", "jsonl", "junit"
+    "jsonl_path": "../reports/events.jsonl",
+    "junit_path": "../reports/junit.xml",
+    "buffer_lines": 100,        # JSON lines held before each file write
+    "queue_size": 10000         # Events held in memory before emit() blocks
+}
@@ -0,0 +1,139 @@
+"""
+Shared keep-alive HTTP connection pool for the Appium command executor
+Every driver in the process sends its commands over the same tuned urllib3 pool
+"""
+
+import threading
+import urllib3
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from appium.webdriver.appium_connection import AppiumConnection
+from appium.webdriver.client_config import AppiumClientConfig
+from config import HTTP_POOL
+from events import log
+
+# Requests sent and TCP connections opened through the shared pool
+POOL_STATS = {
+    "requests": 0,
+    "connections": 0
+}
+_stats_lock = threading.Lock()
+
+_manager = None
+_manager_lock = threading.Lock()
+# Connections per server asked for by reserve_connections, beyond HTTP_POOL["per_host"]
+_reserved = 0
+
+
+def _count(name):
+    with _stats_lock:
+        POOL_STATS[name] += 1
+
+
+class CountingHTTPConnectionPool(HTTPConnectionPool):
+    """HTTP host pool that counts requests and newly opened connections"""
+
+    def _new_conn(self):
+        _count("connections")
+        return super()._new_conn()
+
+    def urlopen(self, *args, **kwargs):
+        _count("requests")
+        return super().urlopen(*args, **kwargs)
+
+
+class CountingHTTPSConnectionPool(HTTPSConnectionPool):
+    """HTTPS host pool that counts requests and newly opened connections"""
+
+    def _new_conn(self):
+        _count("connections")
+        return super()._new_conn()
+
+    def urlopen(self, *args, **kwargs):
+        _count("requests")
+        return super().urlopen(*args, **kwargs)
+
+
+def get_pool_manager():
+    """Process-wide urllib3 PoolManager, created on first use"""
+    global _manager
+    with _manager_lock:
+        if _manager is None:
+            _manager = urllib3.PoolManager(
+                num_pools=HTTP_POOL["max_hosts"],
+                maxsize=max(HTTP_POOL["per_host"], _reserved),
+                block=HTTP_POOL["block"],
+                retries=HTTP_POOL["retries"],
+                timeout=command_timeout()
+            )
+            _manager.pool_classes_by_scheme = {
+                "http": CountingHTTPConnectionPool,
+                "https": CountingHTTPSConnectionPool
+            }
+        return _manager
+
+
+def reserve_connections(count):
+    """Size the per-server pool for count concurrent sessions (call before the first driver starts)
+
+    With HTTP_POOL["block"] a smaller pool would silently queue the extra sessions' commands.
+    """
+    global _reserved
+    if not HTTP_POOL["enabled"] or count <= HTTP_POOL["per_host"]:
+        return
+    with _manager_lock:
+        if _manager is None:
+            _reserved = max(_reserved, count)
+            return
+        size = _manager.connection_pool_kw["maxsize"]
+    if count > size:
+        log(f"⚠️  {count} concurrent sessions share {size} connections per server; "
+            f"commands will queue (raise HTTP_POOL['per_host'])")
+
+
+def command_timeout():
+    """Separate connect and read timeouts for every command"""
+    return urllib3.Timeout(connect=HTTP_POOL["connect_timeout"], read=HTTP_POOL["read_timeout"])
+
+
+class SharedPoolConnection(AppiumConnection):
+    """AppiumConnection that borrows the shared pool instead of opening its own"""
+
+    def _get_connection_manager(self):
+        # Proxied connections keep Selenium's own manager
+        if self._proxy_url:
+            return super()._get_connection_manager()
+        return get_pool_manager()
+
+    def close(self):
+        """Leave the shared pool open for the other drivers (RemoteConnection.close clears it)"""
+        if getattr(self, "_conn", None) is not get_pool_manager():
+            super().close()
+
+
+def command_executor(server_url):
+    """Command executor for webdriver.Remote, on the shared pool when HTTP_POOL is enabled"""
+    if not HTTP_POOL["enabled"]:
+        return server_url
+    client_config = AppiumClientConfig(server_url, keep_alive=True, timeout=command_timeout())
+    return SharedPoolConnection(client_config=client_config)
+
+
+def close_pool():
+    """Close every pooled connection (call once the process is done with all drivers)"""
+    global _manager
+    with _manager_lock:
+        if _manager is not None:
+            _manager.clear()
+            _manager = None
+
+
+def print_pool_report():
+    """Print how many commands reused a pooled connection"""
+    requests, connections = POOL_STATS["requests"], POOL_STATS["connections"]
+    reuse = (requests - connections) / requests * 100 if requests else 0.0
+    print("HTTP Connection Pool:")
+    print("-" * 40)
+    print(f"Requests: {requests}")
+    print(f"Connections opened: {connections}")
+    print(f"Connection reuse: {reuse:.1f}%")
+    print("-" * 40)
@@ -1,16 +1,21 @@
+"""
 Demo Automation Script for ABC Company Mobile App
 Demonstrates the automation framework without requiring actual mobile device
 """
 
 import os
+import sys
 import time
 from datetime import datetime
-from PIL import Image, ImageDraw, ImageFont
+from demo_renderer import render_frame, render_frames
 
 
 class DemoAutomation:
-    def __init__(self):
+    def __init__(self, fast=False, workers=None):
         self.screenshots_dir = "../screenshots"
+        self.fast = fast
+        self.workers = workers
+        self.pending_frames = []
         self.ensure_screenshots_dir()
 
     def ensure_screenshots_dir(self):
@@ -19,44 +24,36 @@ class DemoAutomation:
             os.makedirs(self.screenshots_dir)
 
     def create_demo_screenshot(self, name, content_text):
-        """Create a demo screenshot with text content"""
-        # Create a demo mobile app screenshot
-        width, height = 360, 640  # Typical mobile screen size
-        image = Image.new('RGB', (width, height), color='white')
-        draw = ImageDraw.Draw(image)
-        
-        # Try to use a default font, fallback to basic if not available
-        try:
-            font_title = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", 20)
-            font_text = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", 14)
-        except:
-            font_title = ImageFont.load_default()
-            font_text = ImageFont.load_default()
-        
-        # Draw header
-        draw.rectangle([0, 0, width, 60], fill='#2196F3')
-        draw.text((10, 20), "ABC Company App", fill='white', font=font_title)
-        
-        # Draw content
-        y_position = 80
-        for line in content_text.split('\n'):
-            if line.strip():
-                draw.text((10, y_position), line, fill='black', font=font_text)
-                y_position += 25
-        
-        # Draw navigation bar
-        draw.rectangle([0, height-60, width, height], fill='#f0f0f0')
-        draw.text((10, height-40), "HR | Properties | Profile", fill='black', font=font_text)
-        
-        # Save screenshot
+        """Create a demo screenshot with text content (queued for parallel rendering in fast mode)"""
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         filename = f"{name}_{timestamp}.png"
         filepath = os.path.join(self.screenshots_dir, filename)
-        image.save(filepath)
         
-        print(f"✅ Demo screenshot created: {filename}")
+        if self.fast:
+            self.pending_frames.append((filepath, content_text))
+            return filepath
+        
+        self.save_frame(filepath, render_frame(content_text))
         return filepath
 
+    def save_frame(self, filepath, png):
+        """Write rendered PNG bytes to disk"""
+        with open(filepath, 'wb') as f:
+            f.write(png)
+        print(f"✅ Demo screenshot created: {os.path.basename(filepath)}")
+
+    def flush_frames(self):
+        """Render and save every queued frame in one parallel batch"""
+        frames, self.pending_frames = self.pending_frames, []
+        pngs = render_frames([content for _, content in frames], self.workers)
+        for (filepath, _), png in zip(frames, pngs):
+            self.save_frame(filepath, png)
+
+    def pause(self):
+        """Pause between demo steps (skipped in fast mode)"""
+        if not self.fast:
+            time.sleep(1)
+
     def demo_attendance_search(self):
         """Demonstrate attendance search automation"""
         print("\n" + "="*50)
@@ -67,32 +64,33 @@ class DemoAutomation:
         print("Step 1: Launching ABC Company mobile app...")
         self.create_demo_screenshot("app_launched", 
             "Welcome to ABC Company\n\nPlease login to continue\n\nUsername: azmin@excelbd.com\nPassword: ********")
-        time.sleep(1)
+        self.pause()
         
         # Step 2: Login
         print("Step 2: Performing login...")
         self.create_demo_screenshot("after_login", 
             "Dashboard\n\nWelcome, Azmin!\n\nQuick Actions:\n• Check Attendance\n• Apply Leave\n• View Properties")
-        time.sleep(1)
+        self.pause()
         
         # Step 3: Navigate to HR
         print("Step 3: Navigating to HR section...")
         self.create_demo_screenshot("hr_section", 
             "HR Module\n\n• My Attendance\n• Leave Application\n• Check-IN\n• Reports")
-        time.sleep(1)
+        self.pause()
         
         # Step 4: My Attendance
         print("Step 4: Opening My Attendance...")
         self.create_demo_screenshot("my_attendance_page", 
             "My Attendance\n\nFrom Date: [01/01/2024]\nTo Date: [31/01/2024]\nStatus: [On Leave]\n\n[Search] [Reset]")
-        time.sleep(1)
+        self.pause()
         
         # Step 5: Search Results
         print("Step 5: Displaying search results...")
         self.create_demo_screenshot("attendance_search_results", 
             "Attendance Results\n\nDate: 15/01/2024\nStatus: On Leave\nReason: Annual Leave\n\nDate: 22/01/2024\nStatus: On Leave\nReason: Sick Leave")
-        time.sleep(1)
+        self.pause()
         
+        self.flush_frames()
         print("✅ Attendance search automation demo completed!")
 
     def demo_checkin_leave(self):
@@ -105,32 +103,33 @@ class DemoAutomation:
         print("Step 1: Navigating to Check-IN...")
         self.create_demo_screenshot("checkin_page", 
             "Check-IN\n\nCurrent Time: 09:30 AM\nLocation: Office\n\n[TAP TO CHECK IN]\n\nLast Check-in: Yesterday 09:15 AM")
-        time.sleep(1)
+        self.pause()
         
         # Step 2: Check-IN Success
         print("Step 2: Completing check-in...")
         self.create_demo_screenshot("checkin_success", 
             "Check-IN Successful!\n\nTime: 09:30 AM\nDate: Today\nLocation: Office\n\n✅ You have successfully\nchecked in for today")
-        time.sleep(1)
+        self.pause()
         
         # Step 3: Leave Application
         print("Step 3: Navigating to Leave Application...")
         self.create_demo_screenshot("leave_application_page", 
             "Leave Application\n\n• New Application\n• My Applications\n• Leave Balance\n\nAnnual Leave: 15 days\nSick Leave: 10 days")
-        time.sleep(1)
+        self.pause()
         
         # Step 4: New Leave Application
         print("Step 4: Creating new leave application...")
         self.create_demo_screenshot("new_leave_form", 
             "New Leave Application\n\nLeave Type: [Annual Leave]\nFrom Date: [15/02/2024]\nTo Date: [16/02/2024]\nReason: Personal work\n\n[Submit] [Cancel]")
-        time.sleep(1)
+        self.pause()
         
         # Step 5: Leave Application Confirmation
         print("Step 5: Leave application submitted...")
         self.create_demo_screenshot("leave_application_confirmation", 
             "Application Submitted!\n\nApplication ID: LA2024001\nLeave Type: Annual Leave\nDates: 15-16 Feb 2024\nStatus: Pending Approval\n\n✅ Your leave application\nhas been submitted")
-        time.sleep(1)
+        self.pause()
         
+        self.flush_frames()
         print("✅ Check-IN & Leave application demo completed!")
 
     def run_demo(self):
@@ -154,5 +153,6 @@ class DemoAutomation:
 
 
 if __name__ == "__main__":
-    demo = DemoAutomation()
+    # --fast: no step delays, frames rendered in parallel
+    demo = DemoAutomation(fast="--fast" in sys.argv)
     demo.run_demo()
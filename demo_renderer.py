@@ -0,0 +1,72 @@
+"""
+Rendering engine for DemoAutomation screenshots
+Caches fonts and a pre-rendered header/nav template, and renders frames in parallel
+"""
+
+import io
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from PIL import Image, ImageDraw, ImageFont
+
+WIDTH, HEIGHT = 360, 640  # Typical mobile screen size
+NAV_TOP = HEIGHT - 60
+LINE_HEIGHT = 25
+
+
+@lru_cache(maxsize=None)
+def load_fonts():
+    """Load the title and text fonts once per process"""
+    try:
+        font_title = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", 20)
+        font_text = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", 14)
+    except OSError:
+        font_title = ImageFont.load_default()
+        font_text = ImageFont.load_default()
+    return font_title, font_text
+
+
+def draw_nav_bar(draw, font_text):
+    """Draw the bottom navigation bar"""
+    draw.rectangle([0, NAV_TOP, WIDTH, HEIGHT], fill='#f0f0f0')
+    draw.text((10, HEIGHT - 40), "HR | Properties | Profile", fill='black', font=font_text)
+
+
+@lru_cache(maxsize=None)
+def base_template():
+    """Blank screen with header and navigation bar, rendered once per process"""
+    font_title, font_text = load_fonts()
+    image = Image.new('RGB', (WIDTH, HEIGHT), color='white')
+    draw = ImageDraw.Draw(image)
+    draw.rectangle([0, 0, WIDTH, 60], fill='#2196F3')
+    draw.text((10, 20), "ABC Company App", fill='white', font=font_title)
+    draw_nav_bar(draw, font_text)
+    return image
+
+
+def render_frame(content_text):
+    """Render one demo screen and return its PNG bytes"""
+    _, font_text = load_fonts()
+    image = base_template().copy()
+    draw = ImageDraw.Draw(image)
+
+    y_position = 80
+    for line in content_text.split('\n'):
+        if line.strip():
+            draw.text((10, y_position), line, fill='black', font=font_text)
+            y_position += LINE_HEIGHT
+
+    # The nav bar is drawn last on screen; repaint it if the content reached it
+    if y_position - LINE_HEIGHT + 30 >= NAV_TOP:
+        draw_nav_bar(draw, font_text)
+
+    output = io.BytesIO()
+    image.save(output, format="PNG")
+    return output.getvalue()
+
+
+def render_frames(contents, workers=None):
+    """Render many frames, in a process pool when more than one worker is allowed"""
+    if workers == 1 or len(contents) < 2:
+        return [render_frame(content) for content in contents]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(render_frame, contents))
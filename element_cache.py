@@ -0,0 +1,93 @@
+"""
+Element handle cache for BaseTest.find_element_by_selectors
+Keeps the WebElement found for each logical element per screen fingerprint, so repeated
+interactions on an identical screen skip the find round trip; a handle that has gone stale
+is re-resolved on use
+"""
+
+from collections import OrderedDict
+from appium.webdriver.webelement import WebElement
+from selenium.common.exceptions import StaleElementReferenceException
+from config import ELEMENT_CACHE
+
+# Element cache totals across every driver in this process, for the run summary
+ELEMENT_STATS = {
+    "hits": 0,
+    "misses": 0,
+    "stale": 0,
+    "lost": 0
+}
+
+
+class CachedElement(WebElement):
+    """WebElement that re-runs its lookup once when the server reports it stale
+
+    Every element command goes through _execute, so the retry covers clicks, typing and reads
+    alike; anywhere else (execute_script arguments, action chains) it is an ordinary WebElement.
+    """
+
+    def __init__(self, element, resolve):
+        super().__init__(element.parent, element.id)
+        self.resolve = resolve
+
+    def _execute(self, command, params=None):
+        try:
+            return super()._execute(command, params)
+        except StaleElementReferenceException as e:
+            # A stale element rejects the command before acting on it, so retrying is safe
+            self.refresh(e)
+            return super()._execute(command, params)
+
+    def refresh(self, error):
+        """Point this handle at a new lookup of the element, re-raising if it is gone"""
+        ELEMENT_STATS["stale"] += 1
+        element = self.resolve()
+        if element is None:
+            ELEMENT_STATS["lost"] += 1
+            raise error
+        self._id = element.id
+
+
+class ElementCache:
+    """Screen fingerprint -> {element key: CachedElement}, for the most recently seen screens"""
+
+    def __init__(self, max_screens=None):
+        self.max_screens = max_screens or ELEMENT_CACHE["max_screens"]
+        self.screens = OrderedDict()
+
+    def get(self, fingerprint, key):
+        """Cached element for this key on a screen with this fingerprint, or None"""
+        elements = self.screens.get(fingerprint)
+        element = elements.get(key) if elements else None
+        if elements is not None:
+            self.screens.move_to_end(fingerprint)
+        ELEMENT_STATS["hits" if element is not None else "misses"] += 1
+        return element
+
+    def put(self, fingerprint, key, element, resolve):
+        """Remember a found element and how to look it up again"""
+        elements = self.screens.setdefault(fingerprint, {})
+        self.screens.move_to_end(fingerprint)
+        while len(self.screens) > self.max_screens:
+            self.screens.popitem(last=False)
+        elements[key] = CachedElement(element, resolve)
+        return elements[key]
+
+
+def element_cache(driver):
+    """The driver's element cache, attached on first use (pooled drivers keep theirs across flows)"""
+    cache = getattr(driver, "element_cache", None)
+    if cache is None:
+        cache = ElementCache()
+        driver.element_cache = cache
+    return cache
+
+
+def print_element_report():
+    """Print how many named lookups reused a cached element handle"""
+    lookups = ELEMENT_STATS["hits"] + ELEMENT_STATS["misses"]
+    print("Element Handles:")
+    print("-" * 40)
+    print(f"Reused: {ELEMENT_STATS['hits']}/{lookups}")
+    print(f"Re-resolved after going stale: {ELEMENT_STATS['stale']} ({ELEMENT_STATS['lost']} gone)")
+    print("-" * 40)
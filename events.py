@@ -0,0 +1,316 @@
+"""
+Structured event bus for test results and step events
+Events are queued by the test thread and written to pluggable sinks on a background thread
+"""
+
+import atexit
+import json
+import os
+import queue
+import sys
+import threading
+import time
+from xml.etree import ElementTree
+from config import EVENTS
+from instrumentation import add_listener, remove_listener
+
+_bus = None
+_bus_lock = threading.Lock()
+
+
+class ConsoleSink:
+    """Prints message events exactly as the flows used to print them"""
+
+    def handle(self, event):
+        if event["type"] == "message":
+            print(event["text"])
+
+    def flush(self):
+        sys.stdout.flush()
+
+    def close(self):
+        self.flush()
+
+
+class JsonLinesSink:
+    """Appends every event as one JSON line, writing in batches"""
+
+    def __init__(self, path=None, buffer_lines=None):
+        self.path = path or EVENTS["jsonl_path"]
+        self.buffer_lines = buffer_lines or EVENTS["buffer_lines"]
+        self.buffer = []
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def handle(self, event):
+        self.buffer.append(json.dumps(event, ensure_ascii=False))
+        if len(self.buffer) >= self.buffer_lines:
+            self.flush()
+
+    def flush(self):
+        if not self.buffer:
+            return
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write("\n".join(self.buffer) + "\n")
+        self.buffer = []
+
+    def close(self):
+        self.flush()
+
+
+class JUnitSink:
+    """Collects flow results and writes a JUnit XML report when closed"""
+
+    def __init__(self, path=None):
+        self.path = path or EVENTS["junit_path"]
+        self.cases = []
+        self.output = {}
+        self.artifacts = {}
+
+    def handle(self, event):
+        flow = event.get("flow")
+        # The same flow may run on several devices in one report
+        key = (event.get("device"), flow)
+        if event["type"] == "message" and flow:
+            self.output.setdefault(key, []).append(event["text"])
+        elif event["type"] == "artifact" and flow:
+            self.artifacts.setdefault(key, []).append(event["path"])
+        elif event["type"] == "flow_end":
+            # Output so far belongs to this run; a repeat of the flow on the device starts afresh
+            self.cases.append(dict(event, output=self.output.pop(key, []), artifacts=self.artifacts.pop(key, [])))
+
+    def flush(self):
+        if not self.cases:
+            return
+        suite = ElementTree.Element("testsuite", {
+            "name": "abc_company_automation",
+            "tests": str(len(self.cases)),
+            "failures": str(sum(1 for case in self.cases if case["outcome"] == "failed")),
+            "errors": str(sum(1 for case in self.cases if case["outcome"] == "error")),
+            "time": f"{sum(case['duration'] for case in self.cases):.3f}"
+        })
+        for case in self.cases:
+            flow = case["flow"]
+            testcase = ElementTree.SubElement(suite, "testcase", {
+                "classname": case.get("device") or "automation",
+                "name": flow,
+                "time": f"{case['duration']:.3f}"
+            })
+            if case["outcome"] == "failed":
+                ElementTree.SubElement(testcase, "failure", {"message": case.get("error") or f"{flow} failed"})
+            elif case["outcome"] == "error":
+                ElementTree.SubElement(testcase, "error", {"message": case.get("error") or f"{flow} crashed"})
+            lines = list(case["output"])
+            lines += [f"[[ATTACHMENT|{path}]]" for path in case["artifacts"]]
+            if lines:
+                ElementTree.SubElement(testcase, "system-out").text = "\n".join(lines)
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        ElementTree.ElementTree(suite).write(self.path, encoding="utf-8", xml_declaration=True)
+
+    def close(self):
+        self.flush()
+
+
+class RecordingSink:
+    """Keeps the events a JUnit report is built from, for a parallel worker to hand to its parent"""
+
+    TYPES = ("message", "artifact", "flow_end")
+
+    def __init__(self):
+        self.events = []
+
+    def handle(self, event):
+        if event["type"] in self.TYPES:
+            self.events.append(event)
+
+    def drain(self):
+        events, self.events = self.events, []
+        return events
+
+    def flush(self):
+        pass
+
+    def close(self):
+        pass
+
+
+SINKS = {
+    "console": ConsoleSink,
+    "jsonl": JsonLinesSink,
+    "junit": JUnitSink,
+    "record": RecordingSink
+}
+
+
+class EventBus:
+    """Bounded queue of events drained by one dispatcher thread into every sink"""
+
+    def __init__(self, sinks, queue_size=None):
+        self.sinks = sinks
+        self.queue = queue.Queue(maxsize=queue_size or EVENTS["queue_size"])
+        self.context = threading.local()
+        self.pid = os.getpid()
+        self.thread = threading.Thread(target=self.dispatch, name="event-bus", daemon=True)
+        self.thread.start()
+
+    def set_context(self, **fields):
+        """Fields added to every event emitted from this thread (e.g. the running flow)"""
+        self.context.fields = {name: value for name, value in fields.items() if value is not None}
+
+    def emit(self, event_type, **fields):
+        """Queue one event; the test thread never formats or writes anything"""
+        event = {"type": event_type, "ts": time.time(), "pid": os.getpid()}
+        event.update(getattr(self.context, "fields", {}))
+        event.update(fields)
+        self.queue.put(event)
+
+    def dispatch(self):
+        while True:
+            event = self.queue.get()
+            try:
+                if event is None:
+                    break
+                if event["type"] == "_flush":
+                    for sink in self.sinks:
+                        sink.flush()
+                    event["done"].set()
+                    continue
+                if event["type"] == "_replay":
+                    for sink in self.sinks:
+                        if isinstance(sink, event["sink"]):
+                            sink.handle(event["event"])
+                    continue
+                for sink in self.sinks:
+                    try:
+                        sink.handle(event)
+                    except Exception as e:
+                        print(f"✗ Event sink {type(sink).__name__} failed: {str(e)}")
+            finally:
+                self.queue.task_done()
+
+    def replay(self, events, sink_type):
+        """Hand events recorded elsewhere (e.g. in a worker process) to the sinks of one type only"""
+        for event in events:
+            self.queue.put({"type": "_replay", "event": event, "sink": sink_type})
+
+    def flush(self):
+        """Block until every queued event has reached the sinks and the sinks have written it"""
+        done = threading.Event()
+        self.queue.put({"type": "_flush", "done": done})
+        done.wait()
+
+    def close(self):
+        """Flush, stop the dispatcher and close the sinks"""
+        self.queue.put(None)
+        self.thread.join()
+        for sink in self.sinks:
+            sink.close()
+
+
+class StepEventListener:
+    """Turns @step instrumentation into step_start/step_end events"""
+
+    def __init__(self, bus):
+        self.bus = bus
+
+    def step_started(self, name, start):
+        self.bus.emit("step_start", step=name)
+
+    def step_finished(self, name, start, end, outcome):
+        self.bus.emit("step_end", step=name, duration=end - start, outcome=outcome)
+
+
+def get_event_bus(sink_names=None):
+    """Process-wide event bus, started on first use (None when events are disabled)"""
+    global _bus
+    if not EVENTS["enabled"]:
+        return None
+    with _bus_lock:
+        # A forked worker inherits the parent's bus but not its dispatcher thread
+        if _bus is None or _bus.pid != os.getpid():
+            sink_names = EVENTS["sinks"] if sink_names is None else sink_names
+            _bus = EventBus([SINKS[name]() for name in sink_names])
+            _bus.step_listener = StepEventListener(_bus)
+            add_listener(_bus.step_listener)
+            # Queued console lines must still come out if the caller never closes the bus
+            atexit.register(close_event_bus)
+        return _bus
+
+
+def close_event_bus():
+    """Flush and close the event bus, writing the JUnit report"""
+    global _bus
+    with _bus_lock:
+        bus, _bus = _bus, None
+    if bus is not None:
+        remove_listener(bus.step_listener)
+        bus.close()
+
+
+def run_flow(flow_name, runner, *args, device=None):
+    """Run a flow function, emitting flow_start/flow_end events around it"""
+    set_event_context(flow=flow_name, device=device)
+    emit("flow_start")
+    start = time.time()
+    error = None
+    try:
+        result = runner(*args)
+        outcome = "passed" if result else "failed"
+        return result
+    except Exception as e:
+        error = str(e)
+        outcome = "error"
+        raise
+    finally:
+        emit("flow_end", duration=time.time() - start, outcome=outcome, error=error)
+        set_event_context()
+
+
+def log(text):
+    """Console message, routed through the event bus when it is enabled"""
+    bus = get_event_bus()
+    if bus is None:
+        print(text)
+    else:
+        bus.emit("message", text=text)
+
+
+def emit(event_type, **fields):
+    """Emit a structured event if the event bus is enabled"""
+    bus = get_event_bus()
+    if bus is not None:
+        bus.emit(event_type, **fields)
+
+
+def set_event_context(**fields):
+    """Tag this thread's events with fields such as the running flow"""
+    bus = get_event_bus()
+    if bus is not None:
+        bus.set_context(**fields)
+
+
+def recorded_events():
+    """Events the record sink has kept since the last call (flushes the bus first)"""
+    bus = get_event_bus()
+    if bus is None:
+        return []
+    bus.flush()
+    return [event for sink in bus.sinks if isinstance(sink, RecordingSink) for event in sink.drain()]
+
+
+def replay_junit_events(events):
+    """Add a worker's recorded flow events to this process's JUnit report"""
+    bus = get_event_bus()
+    if bus is not None:
+        bus.replay(events, JUnitSink)
+
+
+def flush_events():
+    """Make sure everything logged so far is on the console and in the sinks"""
+    bus = get_event_bus()
+    if bus is not None:
+        bus.flush()
@@ -0,0 +1,830 @@
+"""
+Local stand-in Appium server that simulates the ABC Company HR app
+Speaks the W3C WebDriver/Appium HTTP protocol so webdriver.Remote works unchanged
+
+Usage:
+    python fake_appium_server.py [--port 4723] [--latency 20] [--transition 150]
+"""
+
+import argparse
+import base64
+import json
+import re
+import struct
+import threading
+import time
+import uuid
+import zlib
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from lxml import etree
+from page_snapshot import HierarchySnapshot
+
+APP_PACKAGE = "com.abccompany.app"
+VISIBLE_ROWS = 6
+
+# Screens the app opens directly, by deep link and by activity
+DEEP_LINKS = {
+    "abccompany://home": "home",
+    "abccompany://hr": "hr",
+    "abccompany://hr/attendance": "my_attendance",
+    "abccompany://hr/checkin": "checkin",
+    "abccompany://hr/leave": "leave_application",
+    "abccompany://hr/leave/new": "leave_form"
+}
+ACTIVITIES = {
+    ".MainActivity": "home",
+    ".hr.HRActivity": "hr",
+    ".hr.MyAttendanceActivity": "my_attendance",
+    ".hr.CheckInActivity": "checkin",
+    ".hr.LeaveApplicationActivity": "leave_application",
+    ".hr.LeaveFormActivity": "leave_form"
+}
+# Parent screens put on the back stack under a directly opened screen
+PARENT_SCREENS = {
+    "hr": ["home"],
+    "my_attendance": ["home", "hr"],
+    "checkin": ["home", "hr"],
+    "leave_application": ["home", "hr"],
+    "leave_form": ["home", "hr", "leave_application"]
+}
+STATUSES = ["All", "Present", "Late", "Absent", "On Leave"]
+LEAVE_TYPES = ["Annual Leave", "Sick Leave", "Casual Leave"]
+
+
+class NoSuchElement(Exception):
+    """Locator matched nothing"""
+
+
+class StaleElement(Exception):
+    """Element id no longer refers to something on screen"""
+
+
+class UnknownCommand(Exception):
+    """Route or script not implemented"""
+
+
+def solid_png(width, height, rgb):
+    """Encode a single-colour PNG without any imaging library"""
+    row = b"\x00" + bytes(rgb) * width
+    raw = zlib.compress(row * height, 9)
+
+    def chunk(kind, data):
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data) & 0xffffffff)
+
+    header = struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)
+    return b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", header) + chunk(b"IDAT", raw) + chunk(b"IEND", b"")
+
+
+SCREENSHOT_B64 = base64.b64encode(solid_png(360, 640, (33, 150, 243))).decode()
+
+
+def parse_date(value):
+    """Parse a dd/mm/yyyy date, returning None when it isn't one"""
+    try:
+        return datetime.strptime(value.strip(), "%d/%m/%Y")
+    except (ValueError, AttributeError):
+        return None
+
+
+def attendance_status(day):
+    """Deterministic attendance status for a calendar day"""
+    bucket = (day.toordinal() * 7) % 10
+    if bucket < 2:
+        return "On Leave"
+    if bucket < 4:
+        return "Late"
+    if bucket < 5:
+        return "Absent"
+    return "Present"
+
+
+def attendance_records(from_date, to_date, status):
+    """Weekday attendance records in a date range, filtered by status"""
+    start, end = parse_date(from_date), parse_date(to_date)
+    if not start or not end or end < start:
+        return []
+    records = []
+    day = start
+    while day <= end:
+        if day.weekday() < 5:
+            day_status = attendance_status(day)
+            if status in ("", "All", day_status):
+                records.append({"date": day.strftime("%d/%m/%Y"), "status": day_status})
+        day += timedelta(days=1)
+    return records
+
+
+def node(cls, key, text="", resource_id=None, action=None, children=None, **attrs):
+    """Describe one UI element of a simulated screen"""
+    return {
+        "class": f"android.widget.{cls}",
+        "key": key,
+        "text": text,
+        "resource_id": resource_id,
+        "action": action,
+        "children": children or [],
+        "attrs": attrs
+    }
+
+
+class AppState:
+    """Backend state shared by every session: logins, check-ins and leave applications"""
+
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.device_users = {}
+        self.checked_in = {}
+        self.applications = []
+
+    def reset(self):
+        """Forget check-ins and leave applications, keeping logged-in devices"""
+        with self.lock:
+            self.checked_in.clear()
+            self.applications.clear()
+
+    def check_in(self, username):
+        """Check a user in for today; returns False if they already were"""
+        with self.lock:
+            if username in self.checked_in:
+                return False
+            self.checked_in[username] = datetime.now()
+            return True
+
+    def submit_leave(self, username, leave_type, from_date, to_date, reason):
+        """Record a leave application, returning (application, error message)"""
+        start, end = parse_date(from_date), parse_date(to_date)
+        if not leave_type or not reason.strip():
+            return None, "Please fill all required fields"
+        if not start or not end or end < start:
+            return None, "Invalid leave dates"
+        with self.lock:
+            for application in self.applications:
+                if application["user"] == username and start <= application["to"] and application["from"] <= end:
+                    return None, "Leave dates overlap an existing application"
+            application = {
+                "id": f"LA{len(self.applications) + 1:05d}",
+                "user": username,
+                "type": leave_type,
+                "from": start,
+                "to": end,
+                "reason": reason
+            }
+            self.applications.append(application)
+            return application, None
+
+
+class Session:
+    """One simulated device session with its own screen stack and form fields"""
+
+    def __init__(self, app, capabilities):
+        self.app = app
+        self.id = uuid.uuid4().hex
+        self.capabilities = capabilities
+        self.device = capabilities.get("udid") or capabilities.get("deviceName") or self.id
+        self.implicit_wait = 0.0
+        self.generation = 0
+        self.ready_at = 0.0
+        self.lock = threading.RLock()
+        self.fields = {}
+        self.dropdown = None
+        self.results = None
+        self.results_offset = 0
+        self.message = None
+        self.last_application = None
+        self.username = None
+        self.stack = []
+
+        with app.lock:
+            known_user = app.device_users.get(self.device)
+        if capabilities.get("noReset") and known_user:
+            self.username = known_user
+            self.stack = ["home"]
+        else:
+            self.stack = ["login"]
+
+    @property
+    def screen(self):
+        return self.stack[-1]
+
+    def go(self, screen, transition=0.0):
+        """Navigate to a screen; it stays hidden behind a spinner for the transition time"""
+        self.stack.append(screen)
+        self.changed(transition)
+
+    def back(self):
+        """Pop one screen (or close an open dropdown)"""
+        if self.dropdown:
+            self.dropdown = None
+            return
+        if len(self.stack) > 1:
+            self.stack.pop()
+            self.changed()
+
+    def reset_to(self, screen):
+        """Replace the whole stack with one screen"""
+        self.stack = [screen]
+        self.changed()
+
+    def open(self, screen, transition=0.0):
+        """Open a screen directly (deep link or activity) on top of its parent screens"""
+        if not self.username:
+            # Every screen but login needs a signed-in user
+            self.reset_to("login")
+            return
+        self.stack = PARENT_SCREENS.get(screen, []) + [screen]
+        self.changed(transition)
+
+    def changed(self, transition=0.0):
+        """Invalidate element ids and form state after a screen change"""
+        self.generation += 1
+        self.dropdown = None
+        self.message = None
+        self.ready_at = time.time() + transition
+        if self.screen in ("my_attendance", "leave_form", "login"):
+            self.fields = {}
+            self.results = None
+            self.results_offset = 0
+
+    # ---- Screen definitions ---------------------------------------------
+
+    def nav_bar(self):
+        return node("LinearLayout", "nav", children=[
+            node("TextView", "nav_hr", "HR", "hr_menu", ("goto", "hr"), clickable="true"),
+            node("TextView", "nav_properties", "Properties", "properties_menu", clickable="true"),
+            node("TextView", "nav_profile", "Profile", "profile_menu", clickable="true")
+        ])
+
+    def field_row(self, label, key, hint, cls="EditText", action=None):
+        return node("LinearLayout", f"{key}_row", children=[
+            node("TextView", f"{key}_label", label),
+            node(cls, key, self.fields.get(key, ""), key, action, hint=hint, clickable="true")
+        ])
+
+    def build(self):
+        """Element tree for the current screen"""
+        if time.time() < self.ready_at:
+            return [node("ProgressBar", "spinner", resource_id="loading")]
+
+        builder = getattr(self, f"screen_{self.screen}")
+        children = builder()
+        if self.dropdown:
+            field, options = self.dropdown
+            children.append(node("ListView", "dropdown", children=[
+                node("CheckedTextView", f"option_{index}", option, action=("select", field, option), clickable="true")
+                for index, option in enumerate(options)
+            ]))
+        if self.message:
+            children.append(node("TextView", "message", self.message, "message"))
+        return children
+
+    def screen_login(self):
+        return [
+            node("TextView", "title", "Welcome to ABC Company"),
+            node("EditText", "username", self.fields.get("username", ""), "username", hint="Email or username"),
+            node("EditText", "password", self.fields.get("password", ""), "password", hint="password", password="true"),
+            node("Button", "login", "Login", "login", ("login",), clickable="true")
+        ]
+
+    def screen_home(self):
+        return [
+            node("TextView", "title", "Dashboard"),
+            node("TextView", "welcome", f"Welcome, {self.username}"),
+            self.nav_bar()
+        ]
+
+    def screen_hr(self):
+        return [
+            node("TextView", "title", "HR Module"),
+            node("TextView", "menu_attendance", "My Attendance", "my_attendance", ("goto", "my_attendance"), clickable="true"),
+            node("TextView", "menu_checkin", "Check-IN", "check_in", ("goto", "checkin"), clickable="true"),
+            node("TextView", "menu_leave", "Leave Application", "leave_application", ("goto", "leave_application"), clickable="true"),
+            self.nav_bar()
+        ]
+
+    def screen_my_attendance(self):
+        children = [
+            node("TextView", "title", "My Attendance"),
+            self.field_row("From", "from_date", "From Date"),
+            self.field_row("To", "to_date", "To Date"),
+            node("LinearLayout", "status_row", children=[
+                node("TextView", "status_label", "Status"),
+                node("Spinner", "status_filter", self.fields.get("status_filter", "All"), "status_filter",
+                     ("dropdown", "status_filter", STATUSES), clickable="true")
+            ]),
+            node("Button", "search_button", "Search", "search_button", ("search",), clickable="true")
+        ]
+        if self.results is not None:
+            if self.results:
+                window = self.results[self.results_offset:self.results_offset + VISIBLE_ROWS]
+                rows = [
+                    node("LinearLayout", f"row_{self.results_offset + index}", children=[
+                        node("TextView", f"row_{self.results_offset + index}_date", record["date"], "record_date"),
+                        node("TextView", f"row_{self.results_offset + index}_status", record["status"], "record_status")
+                    ])
+                    for index, record in enumerate(window)
+                ]
+                children.append(node("TextView", "result_count", f"{len(self.results)} records found", "result_count"))
+                children.append(node("RecyclerView", "attendance_list", resource_id="attendance_list",
+                                     children=rows, scrollable="true"))
+            else:
+                children.append(node("TextView", "no_results", "No records found", "no_results"))
+        children.append(self.nav_bar())
+        return children
+
+    def screen_checkin(self):
+        children = [
+            node("TextView", "title", "Check-IN"),
+            node("TextView", "time", f"Current Time: {datetime.now().strftime('%I:%M %p')}")
+        ]
+        with self.app.lock:
+            checked_in = self.username in self.app.checked_in
+        if not checked_in:
+            children.append(node("Button", "checkin_button", "Check In", "checkin_button", ("checkin",), clickable="true"))
+        elif not self.message:
+            children.append(node("TextView", "already", "Already Checked In", "checkin_status"))
+        children.append(self.nav_bar())
+        return children
+
+    def screen_leave_application(self):
+        with self.app.lock:
+            mine = [application for application in self.app.applications if application["user"] == self.username]
+        rows = [
+            node("TextView", f"application_{application['id']}",
+                 f"{application['id']} {application['type']} {application['from']:%d/%m/%Y} - {application['to']:%d/%m/%Y} Pending",
+                 "application_row")
+            for application in mine[-VISIBLE_ROWS:]
+        ]
+        return [
+            node("TextView", "title", "Leave Application"),
+            node("Button", "new_application", "New Application", "new_application", ("goto", "leave_form"), clickable="true"),
+            node("ListView", "applications", resource_id="application_list", children=rows),
+            self.nav_bar()
+        ]
+
+    def screen_leave_form(self):
+        return [
+            node("TextView", "title", "New Leave Application"),
+            node("LinearLayout", "leave_type_row", children=[
+                node("TextView", "leave_type_label", "Leave Type"),
+                node("Spinner", "leave_type", self.fields.get("leave_type", "Select"), "leave_type",
+                     ("dropdown", "leave_type", LEAVE_TYPES), clickable="true")
+            ]),
+            self.field_row("From Date", "from_date", "From Date"),
+            self.field_row("To Date", "to_date", "To Date"),
+            self.field_row("Reason", "reason", "Reason"),
+            node("Button", "submit", "Submit", "submit", ("submit",), clickable="true"),
+            self.nav_bar()
+        ]
+
+    def screen_leave_submitted(self):
+        application = self.last_application
+        return [
+            node("TextView", "title", "Application submitted successfully"),
+            node("TextView", "application_id", f"Application ID: {application['id']}", "application_id"),
+            node("TextView", "application_status", "Status: Pending Approval", "application_status"),
+            self.nav_bar()
+        ]
+
+    # ---- Hierarchy rendering ---------------------------------------------
+
+    def render(self, with_uids=False):
+        """Serialize the current screen as a UiAutomator2-style hierarchy"""
+        root = etree.Element("hierarchy", index="0", rotation="0", width="360", height="640")
+        frame = etree.SubElement(root, "android.widget.FrameLayout", {
+            "index": "0", "package": APP_PACKAGE, "class": "android.widget.FrameLayout", "bounds": "[0,0][360,640]"
+        })
+        position = [0]
+
+        def add(parent, spec, index):
+            top = position[0] * 40
+            attributes = {
+                "index": str(index),
+                "package": APP_PACKAGE,
+                "class": spec["class"],
+                "text": spec["text"],
+                "resource-id": f"{APP_PACKAGE}:id/{spec['resource_id']}" if spec["resource_id"] else "",
+                "content-desc": "",
+                "clickable": "false",
+                "enabled": "true",
+                "displayed": "true",
+                "password": "false",
+                "scrollable": "false",
+                "bounds": f"[0,{top}][360,{top + 40}]"
+            }
+            attributes.update(spec["attrs"])
+            if with_uids:
+                attributes["uid"] = f"{self.generation}-{spec['key']}"
+            element = etree.SubElement(parent, spec["class"], attributes)
+            if not spec["children"]:
+                position[0] += 1
+            for child_index, child in enumerate(spec["children"]):
+                add(element, child, child_index)
+
+        for index, spec in enumerate(self.build()):
+            add(frame, spec, index)
+        return root
+
+    def page_source(self):
+        root = self.render()
+        return etree.tostring(root, encoding="UTF-8", xml_declaration=True, standalone=True).decode("utf-8")
+
+    def specs_by_key(self):
+        """Flatten the current screen's specs by key"""
+        specs = {}
+
+        def walk(spec):
+            specs[spec["key"]] = spec
+            for child in spec["children"]:
+                walk(child)
+
+        for spec in self.build():
+            walk(spec)
+        return specs
+
+    # ---- Element lookup and interaction -----------------------------------
+
+    def find(self, using, value, parent_id=None):
+        """Element ids matching a locator, optionally inside another element"""
+        root = self.render(with_uids=True)
+        snapshot = HierarchySnapshot(etree.tostring(root).decode("utf-8"), APP_PACKAGE)
+        try:
+            matches = snapshot.find_all(using, value)
+        except (etree.XPathError, ValueError) as e:
+            raise NoSuchElement(str(e))
+        if parent_id:
+            parents = snapshot.root.xpath("//*[@uid=$uid]", uid=parent_id)
+            if not parents:
+                raise StaleElement(parent_id)
+            if using == "xpath" and value.startswith("."):
+                matches = parents[0].xpath(value)
+            else:
+                descendants = set(parents[0].iterdescendants())
+                matches = [match for match in matches if match in descendants]
+        return [match.get("uid") for match in matches if hasattr(match, "get") and match.get("uid")]
+
+    def resolve(self, element_id):
+        """Spec for an element id, raising StaleElement if it's gone"""
+        generation, _, key = element_id.partition("-")
+        if generation != str(self.generation):
+            raise StaleElement(element_id)
+        spec = self.specs_by_key().get(key)
+        if spec is None:
+            raise StaleElement(element_id)
+        return spec
+
+    def click(self, element_id, transition):
+        spec = self.resolve(element_id)
+        action = spec["action"]
+        if not action:
+            return
+        kind = action[0]
+        if kind == "goto":
+            if action[1] != self.screen:
+                self.go(action[1], transition)
+        elif kind == "dropdown":
+            self.dropdown = (action[1], action[2])
+        elif kind == "select":
+            self.fields[action[1]] = action[2]
+            self.dropdown = None
+        elif kind == "login":
+            username = self.fields.get("username", "")
+            if "@" in username and self.fields.get("password"):
+                self.username = username
+                with self.app.lock:
+                    self.app.device_users[self.device] = username
+                self.reset_to("home")
+                self.ready_at = time.time() + transition
+            else:
+                self.message = "Invalid username or password"
+        elif kind == "search":
+            self.results = attendance_records(
+                self.fields.get("from_date", ""), self.fields.get("to_date", ""), self.fields.get("status_filter", "All")
+            )
+            self.results_offset = 0
+            self.ready_at = time.time() + transition
+        elif kind == "checkin":
+            if self.app.check_in(self.username):
+                self.message = "Check-in successful"
+            else:
+                self.message = "Already Checked In"
+            self.ready_at = time.time() + transition
+        elif kind == "submit":
+            application, error = self.app.submit_leave(
+                self.username, self.fields.get("leave_type", ""), self.fields.get("from_date", ""),
+                self.fields.get("to_date", ""), self.fields.get("reason", "")
+            )
+            if error:
+                self.message = error
+            else:
+                self.last_application = application
+                self.go("leave_submitted", transition)
+
+    def type_text(self, element_id, text):
+        spec = self.resolve(element_id)
+        key = spec["key"]
+        self.fields[key] = self.fields.get(key, "") + text
+
+    def clear(self, element_id):
+        spec = self.resolve(element_id)
+        self.fields[spec["key"]] = ""
+
+    def scroll(self, direction, percent):
+        """Scroll the results list; returns True while more rows can be revealed"""
+        if not self.results:
+            return False
+        step = max(1, int(VISIBLE_ROWS * percent))
+        last_offset = max(0, len(self.results) - VISIBLE_ROWS)
+        if direction == "up":
+            self.results_offset = max(0, self.results_offset - step)
+            return self.results_offset > 0
+        self.results_offset = min(last_offset, self.results_offset + step)
+        return self.results_offset < last_offset
+
+
+class FakeAppiumServer(ThreadingHTTPServer):
+    """HTTP server holding the simulated app and its sessions"""
+
+    daemon_threads = True
+
+    def __init__(self, address, latency=0.0, transition=0.0):
+        super().__init__(address, FakeAppiumHandler)
+        self.latency = latency
+        self.transition = transition
+        self.app = AppState()
+        self.sessions = {}
+        self.command_counts = {}
+        self.counts_lock = threading.Lock()
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def count(self, command):
+        with self.counts_lock:
+            self.command_counts[command] = self.command_counts.get(command, 0) + 1
+
+
+class FakeAppiumHandler(BaseHTTPRequestHandler):
+    """Routes W3C WebDriver requests to the simulated sessions"""
+
+    protocol_version = "HTTP/1.1"
+    # Send each response in one segment; split writes stall on delayed ACKs with keep-alive
+    disable_nagle_algorithm = True
+    wbufsize = -1
+
+    ROUTES = [
+        ("GET", r"/status", "status"),
+        ("POST", r"/session", "new_session"),
+        ("DELETE", r"/session/(?P<sid>[^/]+)", "delete_session"),
+        ("GET", r"/session/(?P<sid>[^/]+)", "get_session"),
+        ("POST", r"/session/(?P<sid>[^/]+)/timeouts", "set_timeouts"),
+        ("GET", r"/session/(?P<sid>[^/]+)/source", "page_source"),
+        ("GET", r"/session/(?P<sid>[^/]+)/screenshot", "screenshot"),
+        ("GET", r"/session/(?P<sid>[^/]+)/window/rect", "window_rect"),
+        ("GET", r"/session/(?P<sid>[^/]+)/window/(?P<handle>[^/]+)/size", "window_rect"),
+        ("POST", r"/session/(?P<sid>[^/]+)/back", "back"),
+        ("POST", r"/session/(?P<sid>[^/]+)/element", "find_element"),
+        ("POST", r"/session/(?P<sid>[^/]+)/elements", "find_elements"),
+        ("POST", r"/session/(?P<sid>[^/]+)/element/(?P<eid>[^/]+)/element", "find_element"),
+        ("POST", r"/session/(?P<sid>[^/]+)/element/(?P<eid>[^/]+)/elements", "find_elements"),
+        ("POST", r"/session/(?P<sid>[^/]+)/element/(?P<eid>[^/]+)/click", "click"),
+        ("POST", r"/session/(?P<sid>[^/]+)/element/(?P<eid>[^/]+)/value", "send_keys"),
+        ("POST", r"/session/(?P<sid>[^/]+)/element/(?P<eid>[^/]+)/clear", "clear"),
+        ("GET", r"/session/(?P<sid>[^/]+)/element/(?P<eid>[^/]+)/text", "element_text"),
+        ("GET", r"/session/(?P<sid>[^/]+)/element/(?P<eid>[^/]+)/attribute/(?P<name>[^/]+)", "element_attribute"),
+        ("GET", r"/session/(?P<sid>[^/]+)/element/(?P<eid>[^/]+)/(?P<state>displayed|enabled|selected)", "element_state"),
+        ("GET", r"/session/(?P<sid>[^/]+)/element/(?P<eid>[^/]+)/rect", "element_rect"),
+        ("GET", r"/session/(?P<sid>[^/]+)/element/(?P<eid>[^/]+)/name", "element_name"),
+        ("POST", r"/session/(?P<sid>[^/]+)/execute/sync", "execute_script"),
+    ]
+
+    def log_message(self, format, *args):
+        """Keep the console quiet; sessions are reported explicitly"""
+
+    def do_GET(self):
+        self.dispatch("GET")
+
+    def do_POST(self):
+        self.dispatch("POST")
+
+    def do_DELETE(self):
+        self.dispatch("DELETE")
+
+    def dispatch(self, method):
+        path = self.path.split("?")[0].rstrip("/")
+        if path.startswith("/wd/hub"):
+            path = path[len("/wd/hub"):]
+        length = int(self.headers.get("Content-Length") or 0)
+        body = json.loads(self.rfile.read(length) or b"{}") if length else {}
+
+        for route_method, pattern, name in self.ROUTES:
+            match = re.fullmatch(pattern, path)
+            if route_method == method and match:
+                self.server.count(name)
+                if self.server.latency:
+                    time.sleep(self.server.latency)
+                try:
+                    params = match.groupdict()
+                    session = None
+                    if "sid" in params:
+                        session = self.server.sessions.get(params.pop("sid"))
+                        if session is None:
+                            return self.error(404, "invalid session id", "Session does not exist")
+                        with session.lock:
+                            value = getattr(self, name)(session, body, **params)
+                    else:
+                        value = getattr(self, name)(body)
+                    return self.reply(200, {"value": value})
+                except NoSuchElement as e:
+                    return self.error(404, "no such element", str(e) or "An element could not be located")
+                except StaleElement as e:
+                    return self.error(404, "stale element reference", f"Element {e} is no longer attached")
+                except UnknownCommand as e:
+                    return self.error(404, "unknown command", str(e))
+                except Exception as e:
+                    return self.error(500, "unknown error", str(e))
+        self.error(404, "unknown command", f"{method} {path} is not implemented")
+
+    def reply(self, status, payload):
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def error(self, status, error, message):
+        self.reply(status, {"value": {"error": error, "message": message, "stacktrace": ""}})
+
+    # ---- Commands ---------------------------------------------------------
+
+    def status(self, body):
+        return {"ready": True, "message": "Fake Appium server (ABC Company HR app)"}
+
+    def new_session(self, body):
+        requested = body.get("capabilities", {})
+        capabilities = dict(requested.get("alwaysMatch", {}))
+        for first in requested.get("firstMatch", [{}]):
+            capabilities.update(first)
+            break
+        capabilities = {name.split(":", 1)[-1]: value for name, value in capabilities.items()}
+        session = Session(self.server.app, capabilities)
+        self.server.sessions[session.id] = session
+        returned = dict(capabilities)
+        returned.setdefault("deviceName", session.device)
+        return {"sessionId": session.id, "capabilities": returned}
+
+    def get_session(self, session, body):
+        return session.capabilities
+
+    def delete_session(self, session, body):
+        self.server.sessions.pop(session.id, None)
+        return None
+
+    def set_timeouts(self, session, body):
+        if body.get("implicit") is not None:
+            session.implicit_wait = body["implicit"] / 1000.0
+        return None
+
+    def page_source(self, session, body):
+        return session.page_source()
+
+    def screenshot(self, session, body):
+        return SCREENSHOT_B64
+
+    def window_rect(self, session, body, handle=None):
+        return {"x": 0, "y": 0, "width": 360, "height": 640}
+
+    def back(self, session, body):
+        session.back()
+        return None
+
+    def locate(self, session, body, eid):
+        """Poll for matches until the session's implicit wait runs out"""
+        deadline = time.time() + session.implicit_wait
+        while True:
+            matches = session.find(body.get("using"), body.get("value"), eid)
+            if matches or time.time() >= deadline:
+                return matches
+            session.lock.release()
+            try:
+                time.sleep(0.05)
+            finally:
+                session.lock.acquire()
+
+    def find_element(self, session, body, eid=None):
+        matches = self.locate(session, body, eid)
+        if not matches:
+            raise NoSuchElement(f"No element matches {body.get('using')}={body.get('value')}")
+        return {"element-6066-11e4-a52e-4f735466cecf": matches[0], "ELEMENT": matches[0]}
+
+    def find_elements(self, session, body, eid=None):
+        matches = self.locate(session, body, eid)
+        return [{"element-6066-11e4-a52e-4f735466cecf": match, "ELEMENT": match} for match in matches]
+
+    def click(self, session, body, eid):
+        session.click(eid, self.server.transition)
+        return None
+
+    def send_keys(self, session, body, eid):
+        text = body.get("text")
+        if text is None:
+            text = "".join(body.get("value", []))
+        session.type_text(eid, text)
+        return None
+
+    def clear(self, session, body, eid):
+        session.clear(eid)
+        return None
+
+    def element_text(self, session, body, eid):
+        spec = session.resolve(eid)
+        return session.fields.get(spec["key"], spec["text"])
+
+    def element_attribute(self, session, body, eid, name):
+        spec = session.resolve(eid)
+        if name == "text":
+            return session.fields.get(spec["key"], spec["text"])
+        if name in ("resource-id", "resourceId"):
+            return f"{APP_PACKAGE}:id/{spec['resource_id']}" if spec["resource_id"] else None
+        if name in ("class", "className"):
+            return spec["class"]
+        return spec["attrs"].get(name)
+
+    def element_state(self, session, body, eid, state):
+        session.resolve(eid)
+        return state != "selected"
+
+    def element_rect(self, session, body, eid):
+        session.resolve(eid)
+        return {"x": 0, "y": 0, "width": 360, "height": 40}
+
+    def element_name(self, session, body, eid):
+        return session.resolve(eid)["class"]
+
+    def execute_script(self, session, body):
+        script = body.get("script", "")
+        args = body.get("args") or [{}]
+        options = args[0] if args and isinstance(args[0], dict) else {}
+        if script == "mobile: getCurrentPackage":
+            return APP_PACKAGE
+        if script == "mobile: getCurrentActivity":
+            return f".{session.screen}"
+        if script in ("mobile: activateApp", "mobile: launchApp"):
+            session.reset_to("home" if session.username else "login")
+            return None
+        if script == "mobile: terminateApp":
+            session.reset_to("home" if session.username else "login")
+            return True
+        if script == "mobile: deepLink":
+            # Links the app doesn't handle leave it where it was
+            screen = DEEP_LINKS.get(options.get("url"))
+            if screen and options.get("package", APP_PACKAGE) == APP_PACKAGE:
+                session.open(screen, self.server.transition)
+            return None
+        if script == "mobile: startActivity":
+            component = options.get("intent") or options.get("component") or ""
+            package, _, activity = component.partition("/")
+            if activity.startswith(APP_PACKAGE):
+                activity = activity[len(APP_PACKAGE):]
+            if package != APP_PACKAGE or activity not in ACTIVITIES:
+                raise ValueError(f"Activity '{component}' does not exist")
+            session.open(ACTIVITIES[activity], self.server.transition)
+            return None
+        if script in ("mobile: scrollGesture", "mobile: swipeGesture"):
+            return session.scroll(options.get("direction", "down"), float(options.get("percent", 1.0)))
+        raise UnknownCommand(f"Script '{script}' is not supported")
+
+
+def start_server(port=0, latency=0.0, transition=0.0, host="127.0.0.1"):
+    """Start the server on a background thread and return it (port 0 picks a free port)"""
+    server = FakeAppiumServer((host, port), latency=latency, transition=transition)
+    thread = threading.Thread(target=server.serve_forever, name="fake-appium", daemon=True)
+    thread.start()
+    return server
+
+
+def main():
+    """Run the fake server in the foreground"""
+    parser = argparse.ArgumentParser(description="Fake Appium server simulating the ABC Company HR app")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=4723)
+    parser.add_argument("--latency", type=float, default=0.0, help="Per-command latency in milliseconds")
+    parser.add_argument("--transition", type=float, default=0.0, help="Screen transition time in milliseconds")
+    args = parser.parse_args()
+
+    server = FakeAppiumServer((args.host, args.port), latency=args.latency / 1000.0,
+                              transition=args.transition / 1000.0)
+    print(f"✓ Fake Appium server listening on {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n✓ Fake Appium server stopped")
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
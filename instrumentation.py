@@ -0,0 +1,92 @@
+"""
+Step and WebDriver command instrumentation hooks
+Listeners are only called while registered, so an idle run pays one list check per call
+"""
+
+import functools
+import math
+import time
+
+# Objects with step_started(name, start) and step_finished(name, start, end, outcome),
+# where outcome is "passed", "failed" (the step returned False) or "error" (it raised)
+STEP_LISTENERS = []
+
+# Objects with command_finished(command, start, end)
+COMMAND_LISTENERS = []
+
+
+def step(func):
+    """Mark a BaseTest helper or flow step so listeners see its wall time"""
+    name = func.__name__
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if not STEP_LISTENERS:
+            return func(*args, **kwargs)
+        start = time.perf_counter()
+        for listener in STEP_LISTENERS:
+            listener.step_started(name, start)
+        outcome = "error"
+        try:
+            result = func(*args, **kwargs)
+            outcome = "failed" if result is False else "passed"
+            return result
+        finally:
+            end = time.perf_counter()
+            for listener in STEP_LISTENERS:
+                listener.step_finished(name, start, end, outcome)
+    return wrapper
+
+
+def instrument_driver(driver):
+    """Time every WebDriver command the driver (and its elements) sends"""
+    execute = driver.execute
+
+    def timed_execute(driver_command, params=None):
+        if not COMMAND_LISTENERS:
+            return execute(driver_command, params)
+        start = time.perf_counter()
+        try:
+            return execute(driver_command, params)
+        finally:
+            end = time.perf_counter()
+            for listener in COMMAND_LISTENERS:
+                listener.command_finished(driver_command, start, end)
+
+    driver.execute = timed_execute
+    return driver
+
+
+def add_listener(listener):
+    """Register a listener for steps and/or commands, depending on what it implements"""
+    if hasattr(listener, "step_finished"):
+        STEP_LISTENERS.append(listener)
+    if hasattr(listener, "command_finished"):
+        COMMAND_LISTENERS.append(listener)
+
+
+def remove_listener(listener):
+    """Unregister a listener added with add_listener"""
+    for listeners in (STEP_LISTENERS, COMMAND_LISTENERS):
+        if listener in listeners:
+            listeners.remove(listener)
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a list of numbers"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100.0 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def summarize(values):
+    """Count, total and p50/p95/p99 of a list of durations"""
+    return {
+        "count": len(values),
+        "total": sum(values),
+        "p50": percentile(values, 50),
+        "p95": percentile(values, 95),
+        "p99": percentile(values, 99)
+    }
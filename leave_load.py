@@ -0,0 +1,160 @@
+"""
+Leave-application load generator
+Concurrent logged-in sessions submit leave applications at a target rate; every application
+gets its own date range, so no two ever overlap for any virtual user
+
+Usage:
+    python leave_load.py [--sessions 4] [--rate 2] [--applications 40] [--server http://localhost:4723]
+    python leave_load.py --fake [--latency 20] [--transition 0]    # in-process fake Appium server
+"""
+
+import argparse
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from config import APPIUM_SERVER_URL, LEAVE_LOAD
+from connection_pool import reserve_connections
+from instrumentation import summarize
+from load_harness import add_harness_arguments, run_load
+from load_schedule import ArrivalSchedule, constant_rate
+from session_pool import SessionPool
+from events import set_event_context, emit
+from test_checkin_leave import CheckInLeaveTest
+
+DATE_FORMAT = "%d/%m/%Y"
+
+
+def leave_dates(index, settings=None):
+    """Date range of application `index`; ranges never overlap, whichever session submits them"""
+    settings = settings or LEAVE_LOAD
+    first = datetime.strptime(settings["start_date"], DATE_FORMAT)
+    from_date = first + timedelta(days=index * (settings["days"] + settings["gap_days"]))
+    to_date = from_date + timedelta(days=settings["days"] - 1)
+    return from_date.strftime(DATE_FORMAT), to_date.strftime(DATE_FORMAT)
+
+
+def virtual_user(user, session_pool, schedule, start_barrier, settings):
+    """Log in once, then submit applications from the shared schedule until it runs out"""
+    set_event_context(flow="leave_load", user=user)
+    test = CheckInLeaveTest(session_pool)
+    results = []
+    try:
+        ready = False
+        try:
+            ready = test.setup_driver() and test.login()
+        finally:
+            # The schedule starts once every session is logged in, so login time is not part of the run
+            start_barrier.wait()
+        while True:
+            slot = schedule.take()
+            if slot is None:
+                break
+            index, due = slot
+            time.sleep(max(0.0, due - time.perf_counter()))
+            from_date, to_date = leave_dates(index, settings)
+            result = {
+                "user": user,
+                "index": index,
+                "from_date": from_date,
+                "to_date": to_date,
+                "lag": time.perf_counter() - due,
+                "outcome": "error",
+                "latency": None
+            }
+            test.submit_outcome = test.submit_latency = None
+            try:
+                if ready and test.navigate_to_leave_application():
+                    test.create_leave_application({
+                        "leave_type": settings["leave_type"],
+                        "from_date": from_date,
+                        "to_date": to_date,
+                        "reason": f"{settings['reason']} #{index}"
+                    })
+                    result["outcome"] = test.submit_outcome or "failed"
+                    result["latency"] = test.submit_latency
+            except Exception as e:
+                result["error"] = str(e)
+            emit("leave_submit", **result)
+            results.append(result)
+    finally:
+        test.teardown_driver()
+        set_event_context()
+    return results
+
+
+def run_leave_load(server_url=APPIUM_SERVER_URL, settings=None):
+    """Drive settings["sessions"] concurrent sessions and return (results, elapsed seconds)"""
+    settings = dict(LEAVE_LOAD, **(settings or {}))
+    reserve_connections(settings["sessions"])
+    session_pool = SessionPool(server_url)
+    schedule = ArrivalSchedule(constant_rate(settings["applications"], settings["rate"]))
+    start_barrier = threading.Barrier(settings["sessions"], action=schedule.begin)
+    results = []
+    try:
+        with ThreadPoolExecutor(max_workers=settings["sessions"], thread_name_prefix="leave-user") as executor:
+            futures = [
+                executor.submit(virtual_user, user, session_pool, schedule, start_barrier, settings)
+                for user in range(settings["sessions"])
+            ]
+            for future in futures:
+                results.extend(future.result())
+        elapsed = time.perf_counter() - schedule.start
+    finally:
+        session_pool.close()
+    return sorted(results, key=lambda result: result["index"]), elapsed
+
+
+def load_report(results, elapsed, settings=None):
+    """Throughput, submit-to-confirmation latency and error rate of one load run"""
+    settings = dict(LEAVE_LOAD, **(settings or {}))
+    outcomes = {}
+    for result in results:
+        outcomes[result["outcome"]] = outcomes.get(result["outcome"], 0) + 1
+    confirmed = [result["latency"] for result in results if result["outcome"] == "confirmed"]
+    return {
+        "sessions": settings["sessions"],
+        "target_rate": settings["rate"],
+        "submitted": len(results),
+        "elapsed": elapsed,
+        "throughput": len(confirmed) / elapsed if elapsed else 0.0,
+        "latency": summarize(confirmed),
+        "lag": summarize([result["lag"] for result in results]),
+        "outcomes": outcomes,
+        "error_rate": (len(results) - len(confirmed)) / len(results) if results else 0.0
+    }
+
+
+def print_load_report(report):
+    """Print a load run's throughput, latency percentiles and error breakdown"""
+    latency = report["latency"]
+    print("Leave Application Load:")
+    print("-" * 60)
+    print(f"Sessions: {report['sessions']}  Target rate: {report['target_rate'] or 'unpaced'}/s")
+    print(f"Submitted: {report['submitted']} in {report['elapsed']:.1f}s")
+    print(f"Throughput: {report['throughput']:.2f} confirmed applications/s")
+    print(f"Submit to confirmation p50 {latency['p50']:.3f}s  p95 {latency['p95']:.3f}s  p99 {latency['p99']:.3f}s")
+    # Sessions that fall behind the schedule cap the achievable rate
+    print(f"Schedule lag p95: {report['lag']['p95']:.3f}s")
+    print(f"Error rate: {report['error_rate'] * 100:.1f}%  "
+          + "  ".join(f"{outcome}: {count}" for outcome, count in sorted(report["outcomes"].items())))
+    print("-" * 60)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test leave applications from concurrent sessions")
+    parser.add_argument("--sessions", type=int, default=LEAVE_LOAD["sessions"])
+    parser.add_argument("--rate", type=float, default=LEAVE_LOAD["rate"],
+                        help="Target submissions per second across all sessions (0 = unpaced)")
+    parser.add_argument("--applications", type=int, default=LEAVE_LOAD["applications"])
+    add_harness_arguments(parser)
+    args = parser.parse_args()
+
+    settings = {"sessions": args.sessions, "rate": args.rate, "applications": args.applications}
+    results, elapsed = run_load(args, lambda server_url: run_leave_load(server_url, settings))
+
+    print_load_report(load_report(results, elapsed, settings))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+"""
+Command-line harness shared by the load generators
+Common options, console/event setup and the optional in-process fake Appium server
+"""
+
+from config import APPIUM_SERVER_URL
+from fake_appium_server import start_server
+from events import get_event_bus, flush_events
+
+
+def add_harness_arguments(parser):
+    """Add the --server, --fake, --latency, --transition and --verbose options"""
+    parser.add_argument("--server", default=APPIUM_SERVER_URL, help="Appium server URL")
+    parser.add_argument("--fake", action="store_true", help="Run against an in-process fake Appium server")
+    parser.add_argument("--latency", type=float, default=20.0, help="Fake server per-command latency in milliseconds")
+    parser.add_argument("--transition", type=float, default=0.0, help="Fake server screen transition in milliseconds")
+    parser.add_argument("--verbose", action="store_true", help="Show the sessions' own output")
+
+
+def run_load(args, run):
+    """Call run(server_url) against the chosen server and return its result once events are written"""
+    # Session output from many threads is only useful when asked for; events still go to the JSON lines file
+    get_event_bus(["console", "jsonl"] if args.verbose else ["jsonl"])
+
+    server = None
+    server_url = args.server
+    if args.fake:
+        server = start_server(latency=args.latency / 1000.0, transition=args.transition / 1000.0)
+        server_url = server.url
+    try:
+        return run(server_url)
+    finally:
+        if server:
+            server.shutdown()
+            server.server_close()
+        flush_events()
@@ -0,0 +1,53 @@
+"""
+Arrival schedules for the load generators
+A schedule hands out numbered arrivals, each due at a fixed offset from the start of the run
+"""
+
+import threading
+import time
+
+
+class ArrivalSchedule:
+    """Thread-safe queue of arrivals shared by every virtual user of a load run"""
+
+    def __init__(self, offsets):
+        self.offsets = list(offsets)
+        self.lock = threading.Lock()
+        self.next_index = 0
+        self.start = None
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def begin(self):
+        self.start = time.perf_counter()
+
+    def take(self):
+        """Next (index, due time), or None once every arrival has been handed out"""
+        with self.lock:
+            if self.next_index >= len(self.offsets):
+                return None
+            index = self.next_index
+            self.next_index += 1
+        return index, self.start + self.offsets[index]
+
+
+def constant_rate(count, rate):
+    """Offsets of `count` arrivals spaced evenly at `rate` per second (all due at once if rate is 0)"""
+    return [index / rate if rate else 0.0 for index in range(count)]
+
+
+def curve_arrivals(points, scale=1.0, resolution=0.01):
+    """Offsets of arrivals following a piecewise-linear rate curve of (second, arrivals per second) points"""
+    offsets = []
+    expected = 0.0
+    for (t0, r0), (t1, r1) in zip(points, points[1:]):
+        t = t0
+        while t < t1:
+            rate = (r0 + (r1 - r0) * (t - t0) / (t1 - t0)) * scale
+            expected += rate * resolution
+            t += resolution
+            # An arrival is due each time the expected count passes the next half
+            while expected >= len(offsets) + 0.5:
+                offsets.append(round(t, 3))
+    return offsets
@@ -0,0 +1,162 @@
+"""
+Navigation graph of the app's screens
+Screens are recognised from one hierarchy snapshot, and routes are the cheapest path of
+menu taps and back presses between two screens
+"""
+
+import heapq
+from appium.webdriver.common.appiumby import AppiumBy
+from config import ANDROID_CAPABILITIES
+from page_snapshot import HierarchySnapshot, snapshots_supported
+
+# Element shown on every screen after login (the HR nav item), so it tells logged in from logged out;
+# only the screens ranked before "home" in SCREEN_MARKERS tell the home screen from the others
+HOME_SCREEN_MARKER = (
+    AppiumBy.XPATH,
+    "//*[contains(@text, 'HR') or contains(@content-desc, 'HR') or contains(@resource-id, 'hr_menu')]"
+)
+
+# Menu entries and buttons that move between screens
+MENU_SELECTORS = {
+    "hr_menu": [
+        (AppiumBy.XPATH, "//android.widget.TextView[contains(@text, 'HR')]"),
+        (AppiumBy.XPATH, "//android.widget.Button[contains(@text, 'HR')]"),
+        (AppiumBy.ID, "hr_menu"),
+        (AppiumBy.ID, "hr_section"),
+        (AppiumBy.XPATH, "//android.widget.ImageView[contains(@content-desc, 'HR')]")
+    ],
+    "my_attendance_menu": [
+        (AppiumBy.XPATH, "//android.widget.TextView[contains(@text, 'My Attendance')]"),
+        (AppiumBy.XPATH, "//android.widget.Button[contains(@text, 'Attendance')]"),
+        (AppiumBy.ID, "my_attendance"),
+        (AppiumBy.ID, "attendance_menu"),
+        (AppiumBy.XPATH, "//android.widget.TextView[contains(@text, 'Attendance Report')]")
+    ],
+    "checkin_menu": [
+        (AppiumBy.XPATH, "//android.widget.TextView[contains(@text, 'Check-IN') or contains(@text, 'Check In')]"),
+        (AppiumBy.XPATH, "//android.widget.Button[contains(@text, 'Check-IN') or contains(@text, 'Check In')]"),
+        (AppiumBy.ID, "check_in"),
+        (AppiumBy.ID, "checkin"),
+        (AppiumBy.XPATH, "//android.widget.TextView[contains(@text, 'Attendance Check')]")
+    ],
+    "leave_application_menu": [
+        (AppiumBy.XPATH, "//android.widget.TextView[contains(@text, 'Leave Application')]"),
+        (AppiumBy.XPATH, "//android.widget.Button[contains(@text, 'Leave Application')]"),
+        (AppiumBy.ID, "leave_application"),
+        (AppiumBy.ID, "apply_leave"),
+        (AppiumBy.XPATH, "//android.widget.TextView[contains(@text, 'Apply Leave')]")
+    ],
+    "new_application_button": [
+        (AppiumBy.ID, "new_application"),
+        (AppiumBy.ID, "apply_leave_btn"),
+        (AppiumBy.XPATH, "//android.widget.Button[contains(@text, 'New Application')]"),
+        (AppiumBy.XPATH, "//android.widget.Button[contains(@text, 'Apply Leave')]"),
+        (AppiumBy.XPATH, "//android.widget.FloatingActionButton")
+    ]
+}
+
+# Screen -> elements that identify it, most specific screens first: a screen is only
+# recognised if no screen listed before it matches (the HR nav bar, for one, is on most screens)
+SCREEN_MARKERS = [
+    ("login", [
+        (AppiumBy.XPATH, "//android.widget.EditText[@password='true']"),
+        (AppiumBy.XPATH, "//android.widget.Button[contains(@text, 'Login') or contains(@text, 'Sign In')]")
+    ]),
+    ("leave_submitted", [
+        (AppiumBy.XPATH, "//android.widget.TextView[contains(@text, 'submitted successfully')]"),
+        (AppiumBy.XPATH, "//android.widget.TextView[contains(@text, 'Application ID')]")
+    ]),
+    ("leave_form", [
+        (AppiumBy.ID, "leave_type"),
+        (AppiumBy.ID, "leave_type_spinner"),
+        (AppiumBy.XPATH, "//android.widget.TextView[contains(@text, 'Leave Type')]")
+    ]),
+    ("my_attendance", [
+        (AppiumBy.ID, "search_button"),
+        (AppiumBy.ID, "status_filter"),
+        (AppiumBy.XPATH, "//android.widget.Spinner[contains(@hint, 'Status')]")
+    ]),
+    ("checkin", [
+        (AppiumBy.ID, "checkin_button"),
+        (AppiumBy.ID, "check_in_btn"),
+        (AppiumBy.XPATH, "//android.widget.Button[contains(@text, 'Check In') or contains(@text, 'Clock In')]"),
+        (AppiumBy.XPATH, "//android.widget.TextView[contains(@text, 'Checked In') or contains(@text, 'Check-in successful')]")
+    ]),
+    ("leave_application", MENU_SELECTORS["new_application_button"]),
+    ("hr", MENU_SELECTORS["my_attendance_menu"][:1] + MENU_SELECTORS["checkin_menu"][:1]),
+    ("home", [HOME_SCREEN_MARKER])
+]
+SCREENS = [screen for screen, _ in SCREEN_MARKERS]
+
+# Edges (from, to, action): ("tap", MENU_SELECTORS name) or ("back",)
+# A back press is assumed to return to the screen the menus lead down from
+NAVIGATION_EDGES = [
+    ("home", "hr", ("tap", "hr_menu")),
+    ("hr", "home", ("back",)),
+    ("hr", "my_attendance", ("tap", "my_attendance_menu")),
+    ("hr", "checkin", ("tap", "checkin_menu")),
+    ("hr", "leave_application", ("tap", "leave_application_menu")),
+    ("my_attendance", "hr", ("back",)),
+    ("my_attendance", "hr", ("tap", "hr_menu")),
+    ("checkin", "hr", ("back",)),
+    ("checkin", "hr", ("tap", "hr_menu")),
+    ("leave_application", "hr", ("back",)),
+    ("leave_application", "hr", ("tap", "hr_menu")),
+    ("leave_application", "leave_form", ("tap", "new_application_button")),
+    ("leave_form", "leave_application", ("back",)),
+    ("leave_submitted", "hr", ("tap", "hr_menu"))
+]
+
+# WebDriver commands an action costs: a tap is a snapshot lookup, a find and a click
+ACTION_COSTS = {"tap": 3, "back": 1}
+
+# Old fixed sleep per destination screen, used as the arrival wait budget
+ARRIVAL_BUDGETS = {"hr": 2, "home": 2, "leave_form": 2}
+
+
+def detect_screen_in(snapshot):
+    """Name of the screen a hierarchy snapshot shows, or None"""
+    for screen, markers in SCREEN_MARKERS:
+        if any(snapshot.matches(by, value) for by, value in markers):
+            return screen
+    return None
+
+
+def detect_screen(driver):
+    """Name of the screen currently shown, from one page-source fetch (None if unrecognised)"""
+    if snapshots_supported():
+        return detect_screen_in(HierarchySnapshot(driver.page_source, ANDROID_CAPABILITIES.get("appPackage")))
+    for screen, markers in SCREEN_MARKERS:
+        if any(driver.find_elements(by, value) for by, value in markers):
+            return screen
+    return None
+
+
+def screen_shown(screen):
+    """Screen-wait condition: ready once the given screen is recognised"""
+    def condition(driver):
+        return detect_screen(driver) == screen
+    return condition
+
+
+def shortest_route(source, target, excluded=()):
+    """Cheapest list of (from, to, action) hops from source to target, or None if unreachable"""
+    if source == target:
+        return []
+    queue = [(0, 0, source, [])]
+    done = set()
+    order = 0
+    while queue:
+        cost, _, screen, route = heapq.heappop(queue)
+        if screen == target:
+            return route
+        if screen in done:
+            continue
+        done.add(screen)
+        for edge in NAVIGATION_EDGES:
+            start, end, action = edge
+            if start != screen or end in done or edge in excluded:
+                continue
+            order += 1
+            heapq.heappush(queue, (cost + ACTION_COSTS[action[0]], order, end, route + [edge]))
+    return None
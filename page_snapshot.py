@@ -0,0 +1,143 @@
+"""
+UI hierarchy snapshot for evaluating selectors locally
+One page-source fetch answers every candidate selector without extra round trips
+"""
+
+import time
+from appium.webdriver.common.appiumby import AppiumBy
+from config import SNAPSHOT_CACHE
+
+try:
+    from lxml import etree
+except ImportError:
+    etree = None
+
+
+def snapshots_supported():
+    """Local selector evaluation needs lxml for full XPath support"""
+    return etree is not None
+
+
+class HierarchySnapshot:
+    """Parsed page source that answers "would this selector match?" locally"""
+
+    def __init__(self, source, app_package=None):
+        parser = etree.XMLParser(recover=True, huge_tree=True)
+        self.root = etree.fromstring(source.encode("utf-8"), parser)
+        self.app_package = app_package
+        self._fingerprint = None
+
+    def fingerprint(self):
+        """Identity of the screen's structure: the widget classes and resource-ids it contains
+
+        Text, bounds and state are left out, so typing into a field or a longer result list does
+        not make it a different screen, while an opened dropdown or another screen does.
+        """
+        if self._fingerprint is None:
+            self._fingerprint = hash(frozenset((node.tag, node.get("resource-id")) for node in self.root.iter()))
+        return self._fingerprint
+
+    def matches(self, by, value):
+        """True/False if the selector matches, None if it cannot be evaluated locally"""
+        try:
+            return bool(self.find_all(by, value))
+        except (etree.XPathError, ValueError):
+            return None
+
+    def find_all(self, by, value):
+        """Nodes matching a (by, value) selector"""
+        if by == AppiumBy.XPATH:
+            return self.root.xpath(value)
+        if by == AppiumBy.ID:
+            full_id = f"{self.app_package}:id/{value}" if self.app_package else value
+            return self.root.xpath("//*[@resource-id=$short or @resource-id=$full]", short=value, full=full_id)
+        if by == AppiumBy.CLASS_NAME:
+            return self.root.xpath("//*[@class=$name or name()=$name]", name=value)
+        if by == AppiumBy.ACCESSIBILITY_ID:
+            return self.root.xpath("//*[@content-desc=$desc]", desc=value)
+        raise ValueError(f"Unsupported locator strategy: {by}")
+
+
+# WebDriver commands that only read the screen; anything else may change it and drops the cached snapshot
+READ_ONLY_COMMANDS = {
+    "findElement", "findElements", "findChildElement", "findChildElements",
+    "getPageSource", "screenshot", "elementScreenshot",
+    "getElementText", "getElementAttribute", "getElementProperty", "getElementRect", "getElementTagName",
+    "isElementDisplayed", "isElementEnabled", "isElementSelected",
+    "getWindowRect", "getWindowSize", "getTimeouts", "setTimeouts", "getSession", "status"
+}
+
+# Snapshot cache totals across every driver in this process, for the run summary
+SNAPSHOT_STATS = {
+    "hits": 0,
+    "misses": 0,
+    "invalidations": 0,
+    "expired": 0
+}
+
+
+class SnapshotCache:
+    """Last page source of one driver, reused for lookups until a screen-changing command or the TTL
+
+    Every page-source fetch on the driver refreshes the cache, so the last poll of a screen wait
+    also answers the lookups that follow it.
+    """
+
+    def __init__(self, driver, ttl=None):
+        self.ttl = SNAPSHOT_CACHE["ttl"] if ttl is None else ttl
+        self.driver = driver
+        self.source = None
+        self.snapshot = None
+        self.taken_at = 0.0
+        execute = driver.execute
+
+        def caching_execute(driver_command, params=None):
+            if driver_command not in READ_ONLY_COMMANDS:
+                self.invalidate()
+            response = execute(driver_command, params)
+            if driver_command == "getPageSource":
+                self.source = response["value"]
+                self.snapshot = None
+                self.taken_at = time.perf_counter()
+            return response
+
+        driver.execute = caching_execute
+
+    def invalidate(self):
+        """Drop the cached page source"""
+        if self.source is not None:
+            self.source = self.snapshot = None
+            SNAPSHOT_STATS["invalidations"] += 1
+
+    def get(self, app_package=None, fresh=False):
+        """Cached snapshot if still valid, else a new one; fresh=True always fetches (for polling)"""
+        if self.source is not None and not fresh:
+            if time.perf_counter() - self.taken_at <= self.ttl:
+                SNAPSHOT_STATS["hits"] += 1
+                if self.snapshot is None:
+                    self.snapshot = HierarchySnapshot(self.source, app_package)
+                return self.snapshot
+            SNAPSHOT_STATS["expired"] += 1
+        SNAPSHOT_STATS["misses"] += 1
+        self.snapshot = HierarchySnapshot(self.driver.page_source, app_package)
+        return self.snapshot
+
+
+def snapshot_cache(driver):
+    """The driver's snapshot cache, attached on first use (pooled drivers keep theirs)"""
+    cache = getattr(driver, "snapshot_cache", None)
+    if cache is None:
+        cache = SnapshotCache(driver)
+        driver.snapshot_cache = cache
+    return cache
+
+
+def print_snapshot_report():
+    """Print how many hierarchy lookups the snapshot cache answered without a page-source fetch"""
+    lookups = SNAPSHOT_STATS["hits"] + SNAPSHOT_STATS["misses"]
+    print("Hierarchy Snapshots:")
+    print("-" * 40)
+    print(f"Cache hits: {SNAPSHOT_STATS['hits']}/{lookups}")
+    print(f"Fetched for a lookup: {SNAPSHOT_STATS['misses']} ({SNAPSHOT_STATS['expired']} after TTL)")
+    print(f"Invalidated by actions and screen waits: {SNAPSHOT_STATS['invalidations']}")
+    print("-" * 40)
@@ -0,0 +1,103 @@
+"""
+Parallel execution engine for running test flows across a pool of devices
+Each worker process is pinned to one device and keeps one driver for its lifetime
+"""
+
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing.util import Finalize
+from config import ANDROID_CAPABILITIES, DEVICE_POOL, EVENTS
+from session_pool import SessionPool
+from events import get_event_bus, close_event_bus, run_flow, recorded_events, log
+from test_attendance_search import run_attendance_search_test
+from test_checkin_leave import run_checkin_leave_test
+
+FLOWS = {
+    "attendance_search": run_attendance_search_test,
+    "checkin_leave": run_checkin_leave_test
+}
+
+# Per-process state, set up once by _init_worker
+_worker_device = None
+_worker_pool = None
+
+
+def device_capabilities(device):
+    """Merge device specific capabilities into the base Android capabilities"""
+    capabilities = dict(ANDROID_CAPABILITIES)
+    capabilities["deviceName"] = device["name"]
+    for key in ("udid", "systemPort"):
+        if key in device:
+            capabilities[key] = device[key]
+    return capabilities
+
+
+def _init_worker(device_queue):
+    """Pin this worker process to one device from the pool"""
+    global _worker_device, _worker_pool
+    _worker_device = device_queue.get()
+    _worker_pool = SessionPool(_worker_device["server_url"], device_capabilities(_worker_device))
+    Finalize(_worker_pool, _worker_pool.close, exitpriority=10)
+    # The parent writes the JUnit report; the record sink keeps what it needs to send back
+    sinks = [name for name in EVENTS["sinks"] if name != "junit"]
+    get_event_bus(sinks + ["record"] if "junit" in EVENTS["sinks"] else sinks)
+    Finalize(None, close_event_bus, exitpriority=5)
+
+
+def _run_flow(flow_name):
+    """Run one flow on this worker's device"""
+    start = time.time()
+    try:
+        result = run_flow(flow_name, FLOWS[flow_name], _worker_pool, device=_worker_device["name"])
+    except Exception as e:
+        log(f"✗ {flow_name} crashed on {_worker_device['name']}: {str(e)}")
+        result = False
+    return {
+        "flow": flow_name,
+        "device": _worker_device["name"],
+        "result": bool(result),
+        "duration": time.time() - start,
+        # flow_end, messages and artifacts for the parent's JUnit report
+        "events": recorded_events()
+    }
+
+
+def run_parallel(flow_names=None, devices=None, iterations=1):
+    """Schedule flows across the device pool and return per-device results"""
+    flow_names = flow_names or list(FLOWS)
+    devices = devices or DEVICE_POOL
+    if not devices:
+        raise ValueError("Device pool is empty")
+
+    context = multiprocessing.get_context()
+    device_queue = context.Queue()
+    for device in devices:
+        device_queue.put(device)
+
+    jobs = [name for _ in range(iterations) for name in flow_names]
+    results = []
+    with ProcessPoolExecutor(max_workers=len(devices), mp_context=context,
+                             initializer=_init_worker, initargs=(device_queue,)) as executor:
+        futures = [executor.submit(_run_flow, name) for name in jobs]
+        for future in as_completed(futures):
+            results.append(future.result())
+    return results
+
+
+def merge_results(device_results):
+    """Collapse per-device results into the runner's {flow: passed} summary"""
+    test_results = {}
+    for entry in device_results:
+        test_results[entry["flow"]] = test_results.get(entry["flow"], True) and entry["result"]
+    return test_results
+
+
+def print_device_results(device_results):
+    """Print a per-device breakdown of flow results"""
+    print("Per-Device Results:")
+    print("-" * 40)
+    for entry in sorted(device_results, key=lambda e: (e["device"], e["flow"])):
+        status = "PASSED" if entry["result"] else "FAILED"
+        print(f"{entry['device']}: {entry['flow']} {status} ({entry['duration']:.1f}s)")
+    print("-" * 40)
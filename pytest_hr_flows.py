@@ -0,0 +1,231 @@
+"""
+Opt-in pytest plugin exposing the HR flow steps as collected test items
+
+Usage:
+    python -m pytest -p pytest_hr_flows test_attendance_search.py test_checkin_leave.py
+    python -m pytest -p pytest_hr_flows -k "checkin and not leave"
+    python -m pytest -p pytest_hr_flows -n 2 --dist loadgroup    # pytest-xdist, one device per worker
+    python -m pytest -p pytest_hr_flows --hr-shard 1/2 --hr-device emulator-5556
+
+Each flow is a collector whose steps run in order on one borrowed session; a failed step skips
+the rest of its flow. Flows (never single steps) are the unit of sharding.
+"""
+
+import os
+import time
+import zlib
+import pytest
+from config import APPIUM_SERVER_URL, ANDROID_CAPABILITIES, DEVICE_POOL, TEST_DATA
+from session_pool import SessionPool
+from parallel_runner import device_capabilities
+from events import emit, set_event_context, flush_events
+from test_attendance_search import AttendanceSearchTest
+from test_checkin_leave import CheckInLeaveTest
+
+# Flow module -> [(flow class, [(step name, step callable)])]
+FLOW_FILES = {
+    "test_attendance_search.py": [
+        (AttendanceSearchTest, [
+            ("launch_app", lambda test: test.setup_driver()),
+            ("login", lambda test: test.login()),
+            ("navigate_to_my_attendance", lambda test: test.navigate_to_my_attendance()),
+            ("input_date_range", lambda test: test.input_date_range()),
+            ("filter_by_status", lambda test: test.filter_by_status()),
+            ("validate_search_results", lambda test: test.validate_search_results(verify=False)),
+            ("capture_results", lambda test: test.take_screenshot("attendance_search_results", keep=True) is not None),
+            ("verify_result_statuses", lambda test: test.verify_result_statuses(TEST_DATA["attendance_search"]["status"]))
+        ])
+    ],
+    "test_checkin_leave.py": [
+        (CheckInLeaveTest, [
+            ("launch_app", lambda test: test.setup_driver()),
+            ("login", lambda test: test.login()),
+            ("navigate_to_checkin", lambda test: test.navigate_to_checkin()),
+            ("complete_checkin", lambda test: test.complete_checkin()),
+            ("navigate_to_leave_application", lambda test: test.navigate_to_leave_application()),
+            ("create_leave_application", lambda test: test.create_leave_application()),
+            ("capture_confirmation", lambda test: test.take_screenshot("leave_application_confirmation", keep=True) is not None)
+        ])
+    ]
+}
+
+
+class FlowStepFailed(Exception):
+    """A flow step returned False"""
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("hr_flows", "ABC Company HR flows")
+    group.addoption("--hr-device", help="DEVICE_POOL entry to run on (default: one per xdist worker, "
+                                        "or the single device in config.ANDROID_CAPABILITIES)")
+    group.addoption("--hr-shard", help="Run only shard i of n, e.g. 0/2 (flows are assigned by name)")
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "hr_flow(name): step of an ABC Company HR flow")
+    config.addinivalue_line("markers", "xdist_group(name): pytest-xdist loadgroup scheduling group")
+    config.pluginmanager.register(HRDevicePlugin(config), "hr_device_plugin")
+
+
+def pytest_collect_file(file_path, parent):
+    if file_path.name in FLOW_FILES:
+        return FlowFile.from_parent(parent, path=file_path)
+    return None
+
+
+def pytest_collection_modifyitems(config, items):
+    """Keep only this shard's flows when --hr-shard is given"""
+    shard = config.getoption("hr_shard")
+    if not shard:
+        return
+    index, count = (int(part) for part in shard.split("/"))
+    selected, deselected = [], []
+    for item in items:
+        flow = item.get_closest_marker("hr_flow")
+        if flow is None or zlib.crc32(flow.args[0].encode()) % count == index:
+            selected.append(item)
+        else:
+            deselected.append(item)
+    if deselected:
+        config.hook.pytest_deselected(items=deselected)
+        items[:] = selected
+
+
+class HRDevicePlugin:
+    """Session-scoped device and session pool for this pytest process (or xdist worker)"""
+
+    def __init__(self, config):
+        self.config = config
+        self._pool = None
+
+    def device(self):
+        """DEVICE_POOL entry for this process, or None to use the default capabilities"""
+        name = self.config.getoption("hr_device")
+        if name:
+            for device in DEVICE_POOL:
+                if device["name"] == name:
+                    return device
+            raise pytest.UsageError(f"--hr-device {name} is not in DEVICE_POOL")
+        worker = os.environ.get("PYTEST_XDIST_WORKER")
+        if worker and DEVICE_POOL:
+            return DEVICE_POOL[int(worker.lstrip("gw")) % len(DEVICE_POOL)]
+        return None
+
+    def pool(self):
+        """Session pool bound to this process's device, opened on first use"""
+        if self._pool is None:
+            device = self.device()
+            if device:
+                self._pool = SessionPool(device["server_url"], device_capabilities(device))
+            else:
+                self._pool = SessionPool(APPIUM_SERVER_URL, ANDROID_CAPABILITIES)
+        return self._pool
+
+    @pytest.fixture(scope="session")
+    def hr_device(self):
+        """Device this process is pinned to (None means config.ANDROID_CAPABILITIES)"""
+        return self.device()
+
+    @pytest.fixture(scope="session")
+    def hr_session_pool(self):
+        """Session pool of logged-in drivers on this process's device"""
+        return self.pool()
+
+    @pytest.fixture
+    def hr_driver(self, hr_session_pool):
+        """Driver borrowed from the session pool for one test"""
+        session = hr_session_pool.acquire()
+        yield session.driver
+        hr_session_pool.release(session)
+
+    def pytest_sessionfinish(self, session):
+        if self._pool is not None:
+            self._pool.close()
+            self._pool = None
+        flush_events()
+
+
+class FlowFile(pytest.File):
+    """Flow module collected as one FlowCollector per flow class"""
+
+    def collect(self):
+        for flow_class, steps in FLOW_FILES[self.path.name]:
+            yield FlowCollector.from_parent(self, name=flow_class.__name__, flow_class=flow_class, steps=steps)
+
+
+class FlowCollector(pytest.Collector):
+    """One flow: its steps share a BaseTest instance and a pooled driver"""
+
+    def __init__(self, *, flow_class, steps, **kwargs):
+        super().__init__(**kwargs)
+        self.flow_class = flow_class
+        self.steps = steps
+        self.test = None
+        self.completed = 0
+        self.failed_step = None
+        self.started = None
+
+    def collect(self):
+        for index, (name, _) in enumerate(self.steps):
+            item = FlowStepItem.from_parent(self, name=name, index=index)
+            item.add_marker(pytest.mark.hr_flow(self.name))
+            # pytest-xdist --dist loadgroup keeps a flow's steps on one worker
+            item.add_marker(pytest.mark.xdist_group(self.name))
+            yield item
+
+    def setup(self):
+        plugin = self.config.pluginmanager.get_plugin("hr_device_plugin")
+        self.test = self.flow_class(plugin.pool())
+        device = plugin.device()
+        set_event_context(flow=self.name, device=device["name"] if device else None)
+        emit("flow_start")
+        self.started = time.time()
+
+    def run_until(self, index):
+        """Run the flow's steps up to and including index, skipping any already done"""
+        if self.failed_step:
+            pytest.skip(f"earlier step '{self.failed_step}' failed")
+        while self.completed <= index:
+            name, run_step = self.steps[self.completed]
+            try:
+                passed = run_step(self.test)
+            except Exception:
+                self.failed_step = name
+                raise
+            if not passed:
+                self.failed_step = name
+                # Keep the frames leading up to the failure, as the runner does
+                self.test.dump_screenshot_ring()
+                raise FlowStepFailed(f"step '{name}' of {self.name} failed")
+            self.completed += 1
+
+    def teardown(self):
+        if self.test is not None:
+            self.test.teardown_driver()
+            emit("flow_end", duration=time.time() - self.started,
+                 outcome="failed" if self.failed_step else "passed", error=self.failed_step)
+            set_event_context()
+            flush_events()
+
+
+class FlowStepItem(pytest.Item):
+    """One flow step; earlier steps the selection skipped (e.g. with -k) run first, unreported"""
+
+    def __init__(self, *, index, **kwargs):
+        super().__init__(**kwargs)
+        self.index = index
+
+    def runtest(self):
+        try:
+            self.parent.run_until(self.index)
+        finally:
+            # The console sink prints on a background thread; flush so output lands in this item's capture
+            flush_events()
+
+    def repr_failure(self, excinfo):
+        if isinstance(excinfo.value, FlowStepFailed):
+            return str(excinfo.value)
+        return super().repr_failure(excinfo)
+
+    def reportinfo(self):
+        return self.path, None, f"{self.parent.name}::{self.name}"
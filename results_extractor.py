@@ -0,0 +1,108 @@
+"""
+Streaming scroll-and-extract for result lists
+Each visible window of a list is parsed from one hierarchy snapshot, then the list is scrolled
+by one page; records are yielded as they are found, so callers can stop early
+"""
+
+import re
+from appium.webdriver.common.appiumby import AppiumBy
+from config import ANDROID_CAPABILITIES, RESULTS_EXTRACTION
+from page_snapshot import HierarchySnapshot, snapshots_supported
+
+BOUNDS_PATTERN = re.compile(r"\[(-?\d+),(-?\d+)\]\[(-?\d+),(-?\d+)\]")
+
+
+class ResultsExtractor:
+    """Yields the rows of a scrollable list as dicts of field values, each row once"""
+
+    def __init__(self, driver, settings=None):
+        self.driver = driver
+        self.settings = dict(RESULTS_EXTRACTION, **(settings or {}))
+        self.stats = {"pages": 0, "snapshots": 0, "scrolls": 0, "rows": 0, "records": 0}
+
+    def records(self):
+        """Generator of row records, scrolling one page at a time until the list ends
+
+        Round trips are one snapshot and one scroll per page, however many rows a page holds.
+        Windows overlap, so each one is de-duplicated against the previous window only;
+        memory stays bounded by one window whatever the list length.
+        """
+        previous = set()
+        can_scroll = True
+        while self.stats["pages"] < self.settings["max_pages"]:
+            rows, area = self.visible_window()
+            if rows is None:
+                return
+            self.stats["pages"] += 1
+            keys = set()
+            new_rows = 0
+            for record in rows:
+                key = tuple(sorted(record.items()))
+                keys.add(key)
+                if key in previous:
+                    continue
+                new_rows += 1
+                self.stats["records"] += 1
+                yield record
+            # A page with nothing new means the list stopped moving, even if the app says it can scroll
+            if not can_scroll or (self.stats["pages"] > 1 and not new_rows):
+                return
+            previous = keys
+            can_scroll = self.scroll(area)
+
+    def visible_window(self):
+        """(records, scroll area) of the visible rows, or (None, None) if no list is shown"""
+        if snapshots_supported():
+            return self.snapshot_window()
+        return self.element_window()
+
+    def snapshot_window(self):
+        """Parse every visible row from one page-source fetch"""
+        snapshot = HierarchySnapshot(self.driver.page_source, ANDROID_CAPABILITIES.get("appPackage"))
+        self.stats["snapshots"] += 1
+        lists = snapshot.find_all(AppiumBy.XPATH, self.settings["list_xpath"])
+        if not lists:
+            return None, None
+        rows = []
+        for row in lists[0].xpath(self.settings["row_xpath"]):
+            self.stats["rows"] += 1
+            record = {}
+            for field, xpath in self.settings["fields"].items():
+                values = row.xpath(xpath)
+                record[field] = str(values[0]).strip() if values else None
+            if any(record.values()):
+                rows.append(record)
+        return rows, self.bounds_area(lists[0].get("bounds", ""))
+
+    def element_window(self):
+        """Without lxml: read the visible rows element by element (one round trip per field)"""
+        lists = self.driver.find_elements(AppiumBy.XPATH, self.settings["list_xpath"])
+        if not lists:
+            return None, None
+        rows = []
+        for row in lists[0].find_elements(AppiumBy.XPATH, self.settings["row_xpath"]):
+            self.stats["rows"] += 1
+            record = {}
+            for field, xpath in self.settings["fields"].items():
+                # Field XPaths select an attribute; the element XPath is the part before it
+                element_xpath, _, attribute = xpath.rpartition("/@")
+                elements = row.find_elements(AppiumBy.XPATH, element_xpath)
+                record[field] = elements[0].get_attribute(attribute) if elements else None
+            if any(record.values()):
+                rows.append(record)
+        return rows, {"elementId": lists[0].id}
+
+    @staticmethod
+    def bounds_area(bounds):
+        """Scroll gesture area from a UiAutomator2 bounds attribute"""
+        match = BOUNDS_PATTERN.match(bounds)
+        if not match:
+            return {}
+        left, top, right, bottom = (int(value) for value in match.groups())
+        return {"left": left, "top": top, "width": right - left, "height": bottom - top}
+
+    def scroll(self, area):
+        """Scroll the list down by one page; returns whether it can scroll further"""
+        self.stats["scrolls"] += 1
+        options = dict(area, direction="down", percent=self.settings["scroll_percent"])
+        return bool(self.driver.execute_script("mobile: scrollGesture", options))
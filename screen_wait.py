@@ -0,0 +1,116 @@
+"""
+Event-driven screen waits that end as soon as the screen is ready
+Replaces fixed time.sleep() calls with polled screen-ready conditions
+"""
+
+import time
+from appium.webdriver.common.appiumby import AppiumBy
+from selenium.common.exceptions import WebDriverException
+from config import TIMEOUTS, WAITS
+from events import log
+
+# Totals across every wait in this process, for the run summary
+WAIT_TOTALS = {
+    "waits": 0,
+    "actual": 0.0,
+    "budget": 0.0
+}
+
+
+def element_present(*selectors):
+    """Ready when any of the (by, value) selectors matches an element"""
+    def condition(driver):
+        return any(driver.find_elements(by, value) for by, value in selectors)
+    return condition
+
+
+def spinner_gone(xpath=None):
+    """Ready when no progress spinner is on screen"""
+    xpath = xpath or WAITS["spinner_xpath"]
+
+    def condition(driver):
+        return not driver.find_elements(AppiumBy.XPATH, xpath)
+    return condition
+
+
+def hierarchy_stable():
+    """Ready when the UI hierarchy is unchanged between two polls"""
+    state = {"source": None}
+
+    def condition(driver):
+        source = driver.page_source
+        stable = source == state["source"]
+        state["source"] = source
+        return stable
+    return condition
+
+
+def any_of(*conditions):
+    """Ready when any condition is ready"""
+    def condition(driver):
+        return any(check(driver) for check in conditions)
+    return condition
+
+
+def all_of(*conditions):
+    """Ready when every condition is ready"""
+    def condition(driver):
+        return all(check(driver) for check in conditions)
+    return condition
+
+
+def screen_settled():
+    """Default ready condition: no spinner and a stable hierarchy"""
+    return all_of(spinner_gone(), hierarchy_stable())
+
+
+class ScreenWait:
+    """Polls a ready condition with an adaptive interval"""
+
+    def __init__(self, driver, settings=None):
+        self.driver = driver
+        self.settings = dict(WAITS, **(settings or {}))
+
+    def until(self, condition, label, budget):
+        """Wait for condition, giving up after the old sleep budget; returns True if ready"""
+        timeout = budget * self.settings["timeout_factor"]
+        interval = self.settings["initial_poll"]
+        start = time.time()
+        ready = False
+
+        # Polls must not block on the implicit wait
+        self.driver.implicitly_wait(0)
+        try:
+            while True:
+                try:
+                    ready = bool(condition(self.driver))
+                except WebDriverException:
+                    ready = False
+                elapsed = time.time() - start
+                if ready or elapsed >= timeout:
+                    break
+                time.sleep(min(interval, timeout - elapsed))
+                interval = min(interval * self.settings["poll_backoff"], self.settings["max_poll"])
+        finally:
+            self.driver.implicitly_wait(TIMEOUTS["implicit_wait"])
+
+        elapsed = time.time() - start
+        WAIT_TOTALS["waits"] += 1
+        WAIT_TOTALS["actual"] += elapsed
+        WAIT_TOTALS["budget"] += budget
+        if ready:
+            log(f"⏱ {label}: ready in {elapsed:.2f}s (old sleep {budget:.1f}s)")
+        else:
+            log(f"⏱ {label}: not ready after {elapsed:.2f}s (old sleep {budget:.1f}s), continuing")
+        return ready
+
+
+def print_wait_report():
+    """Print total wait time against the old fixed sleep budget"""
+    print("Screen Waits:")
+    print("-" * 40)
+    print(f"Waits: {WAIT_TOTALS['waits']}")
+    print(f"Time waited: {WAIT_TOTALS['actual']:.1f}s")
+    print(f"Old sleep budget: {WAIT_TOTALS['budget']:.1f}s")
+    print(f"Time saved: {WAIT_TOTALS['budget'] - WAIT_TOTALS['actual']:.1f}s")
+    print("-" * 40)
@@ -0,0 +1,126 @@
+"""
+Asynchronous screenshot pipeline and failure-only ring buffer
+The test thread only grabs the base64 payload; writer threads decode, re-encode and save
+"""
+
+import base64
+import io
+import queue
+import threading
+import time
+from collections import deque
+from config import SCREENSHOTS
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+_pipeline = None
+_pipeline_lock = threading.Lock()
+
+
+class ScreenshotPipeline:
+    """Bounded queue of captured frames drained by a pool of writer threads"""
+
+    def __init__(self, writer_threads=None, queue_size=None, reencode=None):
+        writer_threads = writer_threads or SCREENSHOTS["writer_threads"]
+        self.reencode = SCREENSHOTS["reencode"] if reencode is None else reencode
+        # put() blocks when the queue is full, which applies backpressure when the disk falls behind
+        self.queue = queue.Queue(maxsize=queue_size or SCREENSHOTS["queue_size"])
+        self.stats = {
+            "queued": 0,
+            "written": 0,
+            "failed": 0,
+            "blocked_time": 0.0
+        }
+        self.lock = threading.Lock()
+        self.threads = []
+        for index in range(writer_threads):
+            thread = threading.Thread(target=self.writer, name=f"screenshot-writer-{index}", daemon=True)
+            thread.start()
+            self.threads.append(thread)
+
+    def submit(self, filepath, png_base64):
+        """Queue a captured frame for writing; blocks only when the queue is full"""
+        start = time.time()
+        self.queue.put((filepath, png_base64))
+        with self.lock:
+            self.stats["queued"] += 1
+            self.stats["blocked_time"] += time.time() - start
+
+    def writer(self):
+        """Decode, optionally re-encode and write queued frames"""
+        while True:
+            item = self.queue.get()
+            if item is None:
+                self.queue.task_done()
+                break
+            filepath, png_base64 = item
+            try:
+                png = base64.b64decode(png_base64)
+                if self.reencode and Image is not None:
+                    png = self.optimize(png)
+                with open(filepath, 'wb') as f:
+                    f.write(png)
+                with self.lock:
+                    self.stats["written"] += 1
+            except Exception as e:
+                print(f"✗ Failed to write screenshot {filepath}: {str(e)}")
+                with self.lock:
+                    self.stats["failed"] += 1
+            finally:
+                self.queue.task_done()
+
+    def optimize(self, png):
+        """Re-encode a PNG with maximum compression"""
+        output = io.BytesIO()
+        Image.open(io.BytesIO(png)).save(output, format="PNG", optimize=True)
+        return output.getvalue()
+
+    def flush(self):
+        """Block until every queued frame has been written"""
+        self.queue.join()
+
+    def close(self):
+        """Flush and stop the writer threads"""
+        self.flush()
+        for _ in self.threads:
+            self.queue.put(None)
+        for thread in self.threads:
+            thread.join()
+        self.threads = []
+
+
+class ScreenshotRing:
+    """Last N captured frames, bounded by count and total size, held until a failure"""
+
+    def __init__(self, max_frames=None, max_bytes=None):
+        self.max_frames = max_frames or SCREENSHOTS["ring_frames"]
+        self.max_bytes = max_bytes or SCREENSHOTS["ring_max_bytes"]
+        self.frames = deque()
+        self.size = 0
+
+    def push(self, filepath, png_base64):
+        """Add a frame, dropping the oldest frames once over the limits"""
+        self.frames.append((filepath, png_base64))
+        self.size += len(png_base64)
+        while self.frames and (len(self.frames) > self.max_frames or self.size > self.max_bytes):
+            _, dropped = self.frames.popleft()
+            self.size -= len(dropped)
+
+    def drain(self):
+        """Remove and return all buffered frames, oldest first"""
+        frames = list(self.frames)
+        self.frames.clear()
+        self.size = 0
+        return frames
+
+
+def get_screenshot_pipeline():
+    """Process-wide screenshot pipeline, started on first use"""
+    global _pipeline
+    with _pipeline_lock:
+        if _pipeline is None:
+            _pipeline = ScreenshotPipeline()
+        return _pipeline
@@ -0,0 +1,105 @@
+"""
+Persistent learned-selector cache for BaseTest.find_element_by_selectors
+Remembers which fallback selector matched per screen and logical element
+"""
+
+import json
+import os
+import threading
+from config import SELECTOR_CACHE
+from events import log
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+class SelectorCache:
+    """Maps "screen.element" keys to the selector that matched last time"""
+
+    def __init__(self, path=None, max_misses=None):
+        self.path = path or SELECTOR_CACHE["path"]
+        self.max_misses = max_misses or SELECTOR_CACHE["max_misses"]
+        self.entries = {}
+        # Keys learned or evicted since the last save
+        self.changed = set()
+        self.lock = threading.Lock()
+        self.load()
+
+    def load(self):
+        """Load learned selectors from disk, ignoring a missing or corrupt file"""
+        self.entries = self.read()
+
+    def read(self):
+        """Entries currently on disk ({} if the file is missing or unreadable)"""
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            log(f"✗ Ignoring unreadable selector cache: {str(e)}")
+            return {}
+
+    def save(self):
+        """Write this process's changes to disk, merged with what other processes saved meanwhile"""
+        with self.lock:
+            if not self.changed:
+                return
+            entries = self.read()
+            for key in self.changed:
+                if key in self.entries:
+                    entries[key] = self.entries[key]
+                else:
+                    entries.pop(key, None)
+            self.entries = entries
+            self.changed = set()
+            data = json.dumps(entries, indent=2, sort_keys=True)
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            try:
+                with open(tmp_path, 'w') as f:
+                    f.write(data)
+                os.replace(tmp_path, self.path)
+            except OSError as e:
+                log(f"✗ Failed to save selector cache: {str(e)}")
+
+    def order(self, key, selectors):
+        """Return selectors with the learned winner moved to the front"""
+        entry = self.entries.get(key)
+        if not entry:
+            return selectors
+        learned = (entry["by"], entry["value"])
+        if learned not in selectors:
+            return selectors
+        return [learned] + [selector for selector in selectors if selector != learned]
+
+    def record_hit(self, key, selector):
+        """Remember the selector that matched, replacing (demoting) any previous winner"""
+        by, value = selector
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry and (entry["by"], entry["value"]) == (by, value):
+                entry["hits"] += 1
+                entry["misses"] = 0
+            else:
+                self.entries[key] = {"by": by, "value": value, "hits": 1, "misses": 0}
+            self.changed.add(key)
+
+    def record_miss(self, key, selector):
+        """Count a miss against the learned winner, evicting it after repeated misses"""
+        with self.lock:
+            entry = self.entries.get(key)
+            if not entry or (entry["by"], entry["value"]) != tuple(selector):
+                return
+            entry["misses"] += 1
+            if entry["misses"] >= self.max_misses:
+                del self.entries[key]
+            self.changed.add(key)
+
+
+def get_selector_cache():
+    """Process-wide selector cache, loaded on first use"""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = SelectorCache()
+        return _cache
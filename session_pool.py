@@ -0,0 +1,184 @@
+"""
+Session pool for reusing logged-in Appium sessions across test flows
+"""
+
+import threading
+import time
+from appium import webdriver
+from appium.options.common import AppiumOptions
+from instrumentation import instrument_driver
+from connection_pool import command_executor
+from navigation import detect_screen
+from events import log
+from config import APPIUM_SERVER_URL, ANDROID_CAPABILITIES, TIMEOUTS, SESSION_POOL
+
+
+def create_driver(server_url=APPIUM_SERVER_URL, capabilities=ANDROID_CAPABILITIES):
+    """Open a new Appium session"""
+    options = AppiumOptions().load_capabilities(capabilities)
+    driver = instrument_driver(webdriver.Remote(command_executor(server_url), options=options))
+    driver.implicitly_wait(TIMEOUTS["implicit_wait"])
+    return driver
+
+
+class PooledSession:
+    """Appium session owned by a SessionPool"""
+
+    def __init__(self, driver, create_time):
+        self.driver = driver
+        self.created_at = time.time()
+        self.last_used = self.created_at
+        self.create_time = create_time
+        self.login_time = 0.0
+        self.logged_in = False
+        self.username = None
+        self.uses = 1
+
+    def setup_cost(self):
+        """Seconds a fresh session would spend before reaching this state"""
+        return self.create_time + (self.login_time if self.logged_in else 0.0)
+
+
+class SessionPool:
+    """Keeps logged-in sessions warm between test flows"""
+
+    def __init__(self, server_url=APPIUM_SERVER_URL, capabilities=ANDROID_CAPABILITIES, settings=None):
+        self.server_url = server_url
+        self.capabilities = capabilities
+        self.settings = dict(SESSION_POOL, **(settings or {}))
+        self.idle = []
+        self.lock = threading.Lock()
+        self.stats = {
+            "created": 0,
+            "reused": 0,
+            "evicted": 0,
+            "time_saved": 0.0
+        }
+
+    def acquire(self):
+        """Borrow a healthy session, creating a new one if none is idle"""
+        while True:
+            with self.lock:
+                session = self.idle.pop() if self.idle else None
+            if session is None:
+                break
+            if self.is_stale(session) or not self.is_healthy(session):
+                self.evict(session)
+                continue
+            session.uses += 1
+            session.last_used = time.time()
+            with self.lock:
+                self.stats["reused"] += 1
+                self.stats["time_saved"] += session.setup_cost()
+            log(f"✓ Reusing pooled session (saved ~{session.setup_cost():.1f}s)")
+            return session
+
+        start = time.time()
+        driver = create_driver(self.server_url, self.capabilities)
+        session = PooledSession(driver, time.time() - start)
+        with self.lock:
+            self.stats["created"] += 1
+        return session
+
+    def release(self, session):
+        """Return a session to the pool after resetting it to the home screen"""
+        session.last_used = time.time()
+        if self.is_stale(session) or not self.reset_to_home(session):
+            self.evict(session)
+            return
+        with self.lock:
+            self.idle.append(session)
+
+    def mark_logged_in(self, session, login_time, username=None):
+        """Record that the session is logged in (and as whom) and what the login cost"""
+        session.logged_in = True
+        session.login_time = login_time
+        session.username = username
+
+    def is_stale(self, session):
+        """Check idle time, age and use count against the pool limits"""
+        now = time.time()
+        return (
+            now - session.last_used > self.settings["max_idle_seconds"]
+            or now - session.created_at > self.settings["max_session_age"]
+            or session.uses >= self.settings["max_uses"]
+        )
+
+    def is_healthy(self, session):
+        """Cheap round trip to confirm the session is still alive on the server"""
+        try:
+            session.driver.get_window_size()
+            return True
+        except Exception:
+            return False
+
+    def reset_to_home(self, session):
+        """Press back until the home screen is showing, relaunching the app as a last resort"""
+        driver = session.driver
+        try:
+            driver.implicitly_wait(0)
+            for _ in range(self.settings["reset_back_presses"]):
+                screen = self.settled_screen(driver)
+                if screen == "home":
+                    return True
+                if screen == "login":
+                    # Logged out: there is no logged-in state left worth keeping
+                    return False
+                driver.back()
+
+            if self.settled_screen(driver) == "home":
+                return True
+
+            app_package = self.capabilities.get("appPackage")
+            if app_package:
+                driver.activate_app(app_package)
+                return self.settled_screen(driver) == "home"
+            return False
+        except Exception as e:
+            log(f"✗ Failed to reset pooled session: {str(e)}")
+            return False
+        finally:
+            try:
+                driver.implicitly_wait(TIMEOUTS["implicit_wait"])
+            except Exception:
+                pass
+
+    def settled_screen(self, driver):
+        """Screen the app shows, giving a transition after a back press a moment to finish"""
+        deadline = time.time() + self.settings["reset_settle_seconds"]
+        while True:
+            screen = detect_screen(driver)
+            if screen is not None or time.time() >= deadline:
+                return screen
+            time.sleep(0.1)
+
+    def evict(self, session):
+        """Quit a session and drop it from the pool"""
+        with self.lock:
+            if session in self.idle:
+                self.idle.remove(session)
+            self.stats["evicted"] += 1
+        try:
+            session.driver.quit()
+        except Exception:
+            pass
+
+    def close(self):
+        """Quit every idle session"""
+        with self.lock:
+            sessions, self.idle = self.idle, []
+        for session in sessions:
+            try:
+                session.driver.quit()
+            except Exception as e:
+                log(f"✗ Error closing pooled session: {str(e)}")
+
+    def print_report(self):
+        """Print session reuse statistics"""
+        print("Session Pool:")
+        print("-" * 40)
+        print(f"Sessions created: {self.stats['created']}")
+        print(f"Sessions reused: {self.stats['reused']}")
+        print(f"Sessions evicted: {self.stats['evicted']}")
+        print(f"Time saved by reuse: {self.stats['time_saved']:.1f}s")
+        print("-" * 40)
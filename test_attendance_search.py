@@ -1,20 +1,80 @@
+"""
 Automation Task 1: Attendance Report Search
 Automate searching attendance reports within the HR module.
 """
 
+import calendar
+import itertools
 import time
+from datetime import datetime, timedelta
 from appium.webdriver.common.appiumby import AppiumBy
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 from base_test import BaseTest
-from config import TEST_DATA
+from screen_wait import element_present, spinner_gone, all_of
+from results_extractor import ResultsExtractor
+from instrumentation import step, summarize
+from events import log, emit
+from config import TEST_DATA, ATTENDANCE_SWEEP
+
+RESULTS_SELECTORS = [
+    (AppiumBy.ID, "search_results"),
+    (AppiumBy.ID, "attendance_list"),
+    (AppiumBy.XPATH, "//android.widget.ListView"),
+    (AppiumBy.XPATH, "//android.widget.RecyclerView"),
+    (AppiumBy.XPATH, "//android.widget.TextView[contains(@text, 'result') or contains(@text, 'record')]")
+]
+
+NO_RESULTS_SELECTORS = [
+    (AppiumBy.XPATH, "//android.widget.TextView[contains(@text, 'No results')]"),
+    (AppiumBy.XPATH, "//android.widget.TextView[contains(@text, 'No records')]"),
+    (AppiumBy.XPATH, "//android.widget.TextView[contains(@text, 'No data')]")
+]
+
+DATE_FORMAT = "%d/%m/%Y"
+
+
+def within_one_month(from_date, to_date):
+    """True if to_date is on or after from_date and no later than the same day next month"""
+    if to_date < from_date:
+        return False
+    year, month = (from_date.year + 1, 1) if from_date.month == 12 else (from_date.year, from_date.month + 1)
+    day = min(from_date.day, calendar.monthrange(year, month)[1])
+    return to_date <= from_date.replace(year=year, month=month, day=day)
+
+
+def date_windows(start=None, end=None, window_days=None, step_days=None):
+    """Yield (from_date, to_date) strings for every window length from each start date, each ≤ 1 month"""
+    start = datetime.strptime(start or ATTENDANCE_SWEEP["start"], DATE_FORMAT)
+    end = datetime.strptime(end or ATTENDANCE_SWEEP["end"], DATE_FORMAT)
+    window_days = window_days or ATTENDANCE_SWEEP["window_days"]
+    step = timedelta(days=step_days or ATTENDANCE_SWEEP["step_days"])
+    while start <= end:
+        for days in window_days:
+            to_date = start + timedelta(days=days - 1)
+            if to_date > end or not within_one_month(start, to_date):
+                continue
+            yield start.strftime(DATE_FORMAT), to_date.strftime(DATE_FORMAT)
+        start += step
+
+
+def sweep_queries(statuses=None, max_queries=None, **window_settings):
+    """(from_date, to_date, status) queries: every date window with every status, capped"""
+    statuses = statuses or ATTENDANCE_SWEEP["statuses"]
+    max_queries = max_queries or ATTENDANCE_SWEEP["max_queries"]
+    queries = ((from_date, to_date, status)
+               for from_date, to_date in date_windows(**window_settings)
+               for status in statuses)
+    return list(itertools.islice(queries, max_queries))
 
 
 class AttendanceSearchTest(BaseTest):
-    def __init__(self):
-        super().__init__()
+    def __init__(self, session_pool=None):
+        super().__init__(session_pool)
+        self.search_latency = None
 
+    @step
     def test_attendance_report_search(self):
         """
         Main test method for attendance report search
@@ -28,107 +88,161 @@ class AttendanceSearchTest(BaseTest):
         6. Take a screenshot of the search results
         7. Close the app
         """
-        print("=" * 60)
-        print("STARTING ATTENDANCE REPORT SEARCH TEST")
-        print("=" * 60)
+        log("=" * 60)
+        log("STARTING ATTENDANCE REPORT SEARCH TEST")
+        log("=" * 60)
         
         try:
             # Step 1: Launch the ABC Company mobile app
             if not self.setup_driver():
                 return False
             
-            print("Step 1: ✓ ABC Company mobile app launched")
+            log("Step 1: ✓ ABC Company mobile app launched")
             self.take_screenshot("app_launched")
             
             # Login to the app
             if not self.login():
-                print("✗ Login failed, cannot proceed with test")
-                return False
+                return self.step_failed("✗ Login failed, cannot proceed with test")
             
             # Step 2: Navigate to HR -> My Attendance
             if not self.navigate_to_my_attendance():
-                print("✗ Failed to navigate to My Attendance")
-                return False
+                return self.step_failed("✗ Failed to navigate to My Attendance")
             
-            print("Step 2: ✓ Navigated to HR -> My Attendance")
+            log("Step 2: ✓ Navigated to HR -> My Attendance")
             
             # Step 3: Input From Date and To Date
             if not self.input_date_range():
-                print("✗ Failed to input date range")
-                return False
+                return self.step_failed("✗ Failed to input date range")
             
-            print("Step 3: ✓ Date range inputted (gap ≤ 1 month)")
+            log("Step 3: ✓ Date range inputted (gap ≤ 1 month)")
             
             # Step 4: Filter by Status: On Leave
             if not self.filter_by_status():
-                print("✗ Failed to filter by status")
-                return False
+                return self.step_failed("✗ Failed to filter by status")
             
-            print("Step 4: ✓ Filtered by Status: On Leave")
+            log("Step 4: ✓ Filtered by Status: On Leave")
             
             # Step 5: Validate that the search results appear
-            if not self.validate_search_results():
-                print("✗ Search results validation failed")
-                return False
+            if not self.validate_search_results(verify=False):
+                return self.step_failed("✗ Search results validation failed")
             
-            print("Step 5: ✓ Search results validated")
+            log("Step 5: ✓ Search results validated")
             
             # Step 6: Take a screenshot of the search results
-            screenshot_path = self.take_screenshot("attendance_search_results")
+            screenshot_path = self.take_screenshot("attendance_search_results", keep=True)
             if screenshot_path:
-                print(f"Step 6: ✓ Screenshot taken: {screenshot_path}")
+                log(f"Step 6: ✓ Screenshot taken: {screenshot_path}")
             else:
-                print("Step 6: ✗ Failed to take screenshot")
+                log("Step 6: ✗ Failed to take screenshot")
+            
+            # Checking the statuses scrolls to the end of the list, so it waits until the first page is captured
+            if not self.verify_result_statuses(TEST_DATA["attendance_search"]["status"]):
+                return self.step_failed("✗ Search result statuses not verified")
             
-            print("=" * 60)
-            print("ATTENDANCE REPORT SEARCH TEST COMPLETED SUCCESSFULLY")
-            print("=" * 60)
+            log("=" * 60)
+            log("ATTENDANCE REPORT SEARCH TEST COMPLETED SUCCESSFULLY")
+            log("=" * 60)
             return True
             
         except Exception as e:
-            print(f"✗ Test failed with error: {str(e)}")
+            log(f"✗ Test failed with error: {str(e)}")
             self.take_screenshot("test_error")
+            self.dump_screenshot_ring()
             return False
         
         finally:
             # Step 7: Close the app
             self.teardown_driver()
-            print("Step 7: ✓ App closed")
+            log("Step 7: ✓ App closed")
 
-    def navigate_to_my_attendance(self):
-        """Navigate to HR -> My Attendance section"""
+    @step
+    def test_attendance_search_sweep(self, queries=None):
+        """
+        Run many attendance searches back to back in one logged-in session
+        
+        Login and navigation happen once; between queries only the date and status
+        filters are re-entered. Returns the per-query results, or None if the session
+        could not reach My Attendance.
+        """
+        queries = sweep_queries() if queries is None else queries
+        log("=" * 60)
+        log(f"STARTING ATTENDANCE SEARCH SWEEP ({len(queries)} queries)")
+        log("=" * 60)
+        
+        results = []
         try:
-            # First navigate to HR section
-            if not self.navigate_to_hr_section():
-                return False
+            if not self.setup_driver():
+                return None
+            if not self.login():
+                self.step_failed("✗ Login failed, cannot run sweep")
+                return None
+            if not self.navigate_to_my_attendance():
+                self.step_failed("✗ Failed to navigate to My Attendance")
+                return None
             
-            # Look for My Attendance option
-            attendance_selectors = [
-                (AppiumBy.XPATH, "//android.widget.TextView[contains(@text, 'My Attendance')]"),
-                (AppiumBy.XPATH, "//android.widget.Button[contains(@text, 'Attendance')]"),
-                (AppiumBy.ID, "my_attendance"),
-                (AppiumBy.ID, "attendance_menu"),
-                (AppiumBy.XPATH, "//android.widget.TextView[contains(@text, 'Attendance Report')]")
-            ]
+            for index, (from_date, to_date, status) in enumerate(queries, 1):
+                result = self.run_search_query(from_date, to_date, status)
+                results.append(result)
+                latency = f"{result['latency']:.3f}s" if result["latency"] is not None else "-"
+                log(f"{'✓' if result['passed'] else '✗'} Query {index}/{len(queries)}: "
+                    f"{from_date} - {to_date}, {status}: {latency}")
             
-            attendance_element = self.find_element_by_selectors(attendance_selectors)
-            if attendance_element:
-                attendance_element.click()
-                time.sleep(3)
+            latencies = [result["latency"] for result in results if result["latency"] is not None]
+            stats = summarize(latencies)
+            log("=" * 60)
+            log(f"Sweep: {sum(1 for result in results if result['passed'])}/{len(results)} queries passed")
+            log(f"Search latency p50 {stats['p50']:.3f}s  p95 {stats['p95']:.3f}s  p99 {stats['p99']:.3f}s")
+            log("=" * 60)
+            return results
+        
+        except Exception as e:
+            log(f"✗ Sweep failed with error: {str(e)}")
+            self.take_screenshot("sweep_error")
+            self.dump_screenshot_ring()
+            return results
+        
+        finally:
+            self.teardown_driver()
+
+    def run_search_query(self, from_date, to_date, status):
+        """Re-enter the filters on My Attendance and search; latency is from the Search tap to results"""
+        self.search_latency = None
+        passed = (self.input_date_range(from_date, to_date)
+                  and self.filter_by_status(status)
+                  and self.validate_search_results(status))
+        result = {
+            "from_date": from_date,
+            "to_date": to_date,
+            "status": status,
+            "passed": bool(passed),
+            "latency": self.search_latency
+        }
+        emit("query", **result)
+        return result
+
+    @step
+    def navigate_to_my_attendance(self):
+        """Navigate to HR -> My Attendance section"""
+        try:
+            # Cheapest route from wherever the app is (HR menu, then My Attendance, from the home screen)
+            if self.navigate_to("my_attendance"):
                 self.take_screenshot("my_attendance_page")
                 return True
             else:
-                print("✗ My Attendance option not found")
+                log("✗ My Attendance option not found")
                 return False
                 
         except Exception as e:
-            print(f"✗ Error navigating to My Attendance: {str(e)}")
+            log(f"✗ Error navigating to My Attendance: {str(e)}")
             return False
 
-    def input_date_range(self):
-        """Input From Date and To Date with gap ≤ 1 month"""
+    @step
+    def input_date_range(self, from_date=None, to_date=None):
+        """Input From Date and To Date with gap ≤ 1 month (defaults from TEST_DATA)"""
         try:
             test_data = TEST_DATA["attendance_search"]
+            from_date = from_date or test_data["from_date"]
+            to_date = to_date or test_data["to_date"]
             
             # Find and fill From Date
             from_date_selectors = [
@@ -138,13 +252,13 @@ class AttendanceSearchTest(BaseTest):
                 (AppiumBy.XPATH, "//android.widget.TextView[contains(@text, 'From')]/following-sibling::android.widget.EditText")
             ]
             
-            from_date_element = self.find_element_by_selectors(from_date_selectors)
+            from_date_element = self.find_element_by_selectors(from_date_selectors, "from_date")
             if from_date_element:
                 from_date_element.clear()
-                from_date_element.send_keys(test_data["from_date"])
-                print(f"✓ From Date entered: {test_data['from_date']}")
+                from_date_element.send_keys(from_date)
+                log(f"✓ From Date entered: {from_date}")
             else:
-                print("✗ From Date field not found")
+                log("✗ From Date field not found")
                 return False
             
             # Find and fill To Date
@@ -155,23 +269,26 @@ class AttendanceSearchTest(BaseTest):
                 (AppiumBy.XPATH, "//android.widget.TextView[contains(@text, 'To')]/following-sibling::android.widget.EditText")
             ]
             
-            to_date_element = self.find_element_by_selectors(to_date_selectors)
+            to_date_element = self.find_element_by_selectors(to_date_selectors, "to_date")
             if to_date_element:
                 to_date_element.clear()
-                to_date_element.send_keys(test_data["to_date"])
-                print(f"✓ To Date entered: {test_data['to_date']}")
+                to_date_element.send_keys(to_date)
+                log(f"✓ To Date entered: {to_date}")
                 return True
             else:
-                print("✗ To Date field not found")
+                log("✗ To Date field not found")
                 return False
                 
         except Exception as e:
-            print(f"✗ Error inputting date range: {str(e)}")
+            log(f"✗ Error inputting date range: {str(e)}")
             return False
 
-    def filter_by_status(self):
-        """Filter by Status: On Leave"""
+    @step
+    def filter_by_status(self, status=None):
+        """Filter by Status (default from TEST_DATA: On Leave)"""
         try:
+            status = status or TEST_DATA["attendance_search"]["status"]
+            
             # Look for status dropdown or filter
             status_selectors = [
                 (AppiumBy.ID, "status_filter"),
@@ -180,36 +297,40 @@ class AttendanceSearchTest(BaseTest):
                 (AppiumBy.XPATH, "//android.widget.TextView[contains(@text, 'Status')]/following-sibling::android.widget.Spinner")
             ]
             
-            status_element = self.find_element_by_selectors(status_selectors)
+            status_element = self.find_element_by_selectors(status_selectors, "status_filter")
             if status_element:
                 status_element.click()
-                time.sleep(1)
+                self.wait_for_screen("status_options", 1, element_present(
+                    (AppiumBy.XPATH, f"//*[contains(@text, '{status}')]")
+                ))
                 
-                # Look for "On Leave" option
-                on_leave_selectors = [
-                    (AppiumBy.XPATH, "//android.widget.TextView[contains(@text, 'On Leave')]"),
-                    (AppiumBy.XPATH, "//android.widget.CheckedTextView[contains(@text, 'On Leave')]")
+                # Look for the status option
+                option_selectors = [
+                    (AppiumBy.XPATH, f"//android.widget.TextView[contains(@text, '{status}')]"),
+                    (AppiumBy.XPATH, f"//android.widget.CheckedTextView[contains(@text, '{status}')]")
                 ]
                 
-                on_leave_element = self.find_element_by_selectors(on_leave_selectors)
-                if on_leave_element:
-                    on_leave_element.click()
-                    print("✓ Status filtered to 'On Leave'")
-                    time.sleep(1)
+                option_name = status.lower().replace(" ", "_") + "_option"
+                option_element = self.find_element_by_selectors(option_selectors, option_name)
+                if option_element:
+                    option_element.click()
+                    log(f"✓ Status filtered to '{status}'")
+                    self.wait_for_screen("status_selected", 1)
                     return True
                 else:
-                    print("✗ 'On Leave' option not found")
+                    log(f"✗ '{status}' option not found")
                     return False
             else:
-                print("✗ Status filter not found")
+                log("✗ Status filter not found")
                 return False
                 
         except Exception as e:
-            print(f"✗ Error filtering by status: {str(e)}")
+            log(f"✗ Error filtering by status: {str(e)}")
             return False
 
-    def validate_search_results(self):
-        """Validate that search results appear"""
+    @step
+    def validate_search_results(self, status=None, verify=True):
+        """Validate that search results appear and (unless verify=False) every record has the filtered status"""
         try:
             # Look for search button first
             search_selectors = [
@@ -219,55 +340,79 @@ class AttendanceSearchTest(BaseTest):
                 (AppiumBy.XPATH, "//android.widget.Button[contains(@text, 'Filter')]")
             ]
             
-            search_button = self.find_element_by_selectors(search_selectors)
+            search_button = self.probe_selectors(search_selectors, "search_button")
             if search_button:
                 search_button.click()
-                print("✓ Search button clicked")
-                time.sleep(3)
+                start = time.perf_counter()
+                log("✓ Search button clicked")
+                # Ready once the spinner is gone and either a result list or a no-results message is shown
+                self.wait_for_screen("search_results", 3, all_of(
+                    spinner_gone(), element_present(*(RESULTS_SELECTORS + NO_RESULTS_SELECTORS))
+                ))
+                self.search_latency = time.perf_counter() - start
             
             # Look for search results
-            results_selectors = [
-                (AppiumBy.ID, "search_results"),
-                (AppiumBy.ID, "attendance_list"),
-                (AppiumBy.XPATH, "//android.widget.ListView"),
-                (AppiumBy.XPATH, "//android.widget.RecyclerView"),
-                (AppiumBy.XPATH, "//android.widget.TextView[contains(@text, 'result') or contains(@text, 'record')]")
-            ]
-            
-            results_element = self.find_element_by_selectors(results_selectors)
+            results_element = self.probe_selectors(RESULTS_SELECTORS, "results_list")
             if results_element:
-                print("✓ Search results found and displayed")
-                return True
+                log("✓ Search results found and displayed")
+                if not verify:
+                    return True
+                return self.verify_result_statuses(status or TEST_DATA["attendance_search"]["status"])
             else:
                 # Check if "No results" message appears
-                no_results_selectors = [
-                    (AppiumBy.XPATH, "//android.widget.TextView[contains(@text, 'No results')]"),
-                    (AppiumBy.XPATH, "//android.widget.TextView[contains(@text, 'No records')]"),
-                    (AppiumBy.XPATH, "//android.widget.TextView[contains(@text, 'No data')]")
-                ]
-                
-                no_results_element = self.find_element_by_selectors(no_results_selectors)
+                no_results_element = self.probe_selectors(NO_RESULTS_SELECTORS, "no_results_message")
                 if no_results_element:
-                    print("✓ Search executed successfully (No results found for criteria)")
+                    log("✓ Search executed successfully (No results found for criteria)")
                     return True
                 else:
-                    print("✗ No search results or error message found")
+                    log("✗ No search results or error message found")
                     return False
                     
         except Exception as e:
-            print(f"✗ Error validating search results: {str(e)}")
+            log(f"✗ Error validating search results: {str(e)}")
             return False
 
+    def search_result_records(self, extractor=None):
+        """Result records, read a page at a time by scrolling the list (a generator)"""
+        return (extractor or ResultsExtractor(self.driver)).records()
 
-def run_attendance_search_test():
+    @step
+    def verify_result_statuses(self, status):
+        """Check every result record has the filtered status, stopping at the first that doesn't"""
+        if status == "All":
+            return True
+        extractor = ResultsExtractor(self.driver)
+        count = 0
+        for record in self.search_result_records(extractor):
+            if record["status"] != status:
+                log(f"✗ Record {record['date']} has status '{record['status']}', expected '{status}'")
+                return False
+            count += 1
+        # A list with rows that yield no fields means RESULTS_EXTRACTION doesn't fit the app; nothing was checked
+        if extractor.stats["pages"] and not count:
+            log(f"✗ Results list shown but none of the {extractor.stats['rows']} row(s) seen could be read "
+                f"(check RESULTS_EXTRACTION)")
+            return False
+        log(f"✓ All {count} records have status '{status}'")
+        return True
+
+def run_attendance_search_test(session_pool=None):
     """Run the attendance search test"""
-    test = AttendanceSearchTest()
+    test = AttendanceSearchTest(session_pool)
     return test.test_attendance_report_search()
 
 
+def run_attendance_sweep(session_pool=None, queries=None):
+    """Run the attendance search sweep; True if every query passed"""
+    queries = sweep_queries() if queries is None else queries
+    test = AttendanceSearchTest(session_pool)
+    results = test.test_attendance_search_sweep(queries)
+    return results is not None and len(results) == len(queries) and all(result["passed"] for result in results)
+
+
 if __name__ == "__main__":
     success = run_attendance_search_test()
     if success:
-        print("\n🎉 Attendance Search Test PASSED")
+        log("\n🎉 Attendance Search Test PASSED")
     else:
-        print("\n❌ Attendance Search Test FAILED")
+        log("\n❌ Attendance Search Test FAILED")
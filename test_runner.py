@@ -6,20 +6,78 @@ Executes both attendance search and check-in/leave application tests
 import sys
 import time
 from datetime import datetime
-from test_attendance_search import run_attendance_search_test
+from test_attendance_search import run_attendance_search_test, run_attendance_sweep
 from test_checkin_leave import run_checkin_leave_test
+from session_pool import SessionPool
+from screen_wait import print_wait_report
+from base_test import print_lookup_report
+from page_snapshot import print_snapshot_report
+from element_cache import print_element_report
+from parallel_runner import run_parallel, merge_results, print_device_results
+from tracing import start_tracing, finish_tracing
+from connection_pool import print_pool_report
+from command_budget import start_profiler
+from events import log, run_flow, flush_events, close_event_bus, replay_junit_events
+from config import SESSION_POOL, DEVICE_POOL
 
 
 def print_header(title):
     """Print formatted header"""
-    print("\n" + "=" * 80)
-    print(f" {title} ".center(80, "="))
-    print("=" * 80)
+    log("\n" + "=" * 80)
+    log(f" {title} ".center(80, "="))
+    log("=" * 80)
 
 
 def print_footer():
     """Print formatted footer"""
-    print("=" * 80 + "\n")
+    log("=" * 80 + "\n")
+
+
+def print_summary(test_results, start_time, reports=()):
+    """Print final results, followed by any extra report sections"""
+    end_time = datetime.now()
+    duration = end_time - start_time
+    
+    print_header("TEST EXECUTION SUMMARY")
+    log(f"Test execution completed at: {end_time.strftime('%Y-%m-%d %H:%M:%S')}")
+    log(f"Total execution time: {duration}")
+    log("")
+    
+    log("Test Results:")
+    log("-" * 40)
+    
+    passed_tests = 0
+    total_tests = 0
+    
+    for test_name, result in test_results.items():
+        if test_name != 'execution_error':
+            total_tests += 1
+            if result:
+                passed_tests += 1
+                log(f"✅ {test_name.replace('_', ' ').title()}: PASSED")
+            else:
+                log(f"❌ {test_name.replace('_', ' ').title()}: FAILED")
+    
+    if 'execution_error' in test_results:
+        log(f"⚠️  Execution Error: {test_results['execution_error']}")
+    
+    log("-" * 40)
+    log(f"Tests Passed: {passed_tests}/{total_tests}")
+    
+    if passed_tests == total_tests and total_tests > 0:
+        log("🎉 ALL TESTS PASSED!")
+        success_rate = 100
+    else:
+        success_rate = (passed_tests / total_tests * 100) if total_tests > 0 else 0
+        log(f"📊 Success Rate: {success_rate:.1f}%")
+    
+    # Reports print directly, so everything queued on the event bus has to come out first
+    flush_events()
+    for report in reports:
+        print()
+        report()
+    
+    print_footer()
 
 
 def run_all_tests():
@@ -27,85 +85,90 @@ def run_all_tests():
     print_header("ABC COMPANY MOBILE APP AUTOMATION TEST SUITE")
     
     start_time = datetime.now()
-    print(f"Test execution started at: {start_time.strftime('%Y-%m-%d %H:%M:%S')}")
+    log(f"Test execution started at: {start_time.strftime('%Y-%m-%d %H:%M:%S')}")
     
     test_results = {}
+    session_pool = SessionPool() if SESSION_POOL["enabled"] else None
+    tracer = start_tracing("all_tests")
+    profiler = start_profiler()
     
     try:
         # Test 1: Attendance Report Search
         print_header("TEST 1: ATTENDANCE REPORT SEARCH")
-        print("Executing attendance report search automation...")
+        log("Executing attendance report search automation...")
         
-        attendance_result = run_attendance_search_test()
+        attendance_result = run_flow('attendance_search', run_attendance_search_test, session_pool)
         test_results['attendance_search'] = attendance_result
         
         if attendance_result:
-            print("✅ Attendance Report Search Test: PASSED")
+            log("✅ Attendance Report Search Test: PASSED")
         else:
-            print("❌ Attendance Report Search Test: FAILED")
+            log("❌ Attendance Report Search Test: FAILED")
         
         print_footer()
         
-        # Wait between tests
-        print("Waiting 5 seconds before next test...")
-        time.sleep(5)
+        # Wait between tests (pooled sessions are already reset to the home screen)
+        if not session_pool:
+            log("Waiting 5 seconds before next test...")
+            time.sleep(5)
         
         # Test 2: Check-IN & Leave Application
         print_header("TEST 2: CHECK-IN & LEAVE APPLICATION")
-        print("Executing check-in and leave application automation...")
+        log("Executing check-in and leave application automation...")
         
-        checkin_leave_result = run_checkin_leave_test()
+        checkin_leave_result = run_flow('checkin_leave', run_checkin_leave_test, session_pool)
         test_results['checkin_leave'] = checkin_leave_result
         
         if checkin_leave_result:
-            print("✅ Check-IN & Leave Application Test: PASSED")
+            log("✅ Check-IN & Leave Application Test: PASSED")
         else:
-            print("❌ Check-IN & Leave Application Test: FAILED")
+            log("❌ Check-IN & Leave Application Test: FAILED")
         
         print_footer()
         
     except Exception as e:
-        print(f"❌ Test execution failed with error: {str(e)}")
+        log(f"❌ Test execution failed with error: {str(e)}")
         test_results['execution_error'] = str(e)
     
-    # Print final results
-    end_time = datetime.now()
-    duration = end_time - start_time
+    finally:
+        if session_pool:
+            session_pool.close()
+        finish_tracing(tracer)
+        if profiler:
+            profiler.stop()
     
-    print_header("TEST EXECUTION SUMMARY")
-    print(f"Test execution completed at: {end_time.strftime('%Y-%m-%d %H:%M:%S')}")
-    print(f"Total execution time: {duration}")
-    print()
+    reports = [print_wait_report, print_lookup_report, print_snapshot_report, print_element_report, print_pool_report]
+    if profiler:
+        reports.append(profiler.print_report)
+    if session_pool:
+        reports.append(session_pool.print_report)
+    print_summary(test_results, start_time, reports)
     
-    print("Test Results:")
-    print("-" * 40)
-    
-    passed_tests = 0
-    total_tests = 0
-    
-    for test_name, result in test_results.items():
-        if test_name != 'execution_error':
-            total_tests += 1
-            if result:
-                passed_tests += 1
-                print(f"✅ {test_name.replace('_', ' ').title()}: PASSED")
-            else:
-                print(f"❌ {test_name.replace('_', ' ').title()}: FAILED")
+    return test_results
+
+
+def run_parallel_tests(iterations=1):
+    """Run all automation tests in parallel across the device pool"""
+    print_header("ABC COMPANY MOBILE APP AUTOMATION TEST SUITE (PARALLEL)")
     
-    if 'execution_error' in test_results:
-        print(f"⚠️  Execution Error: {test_results['execution_error']}")
+    start_time = datetime.now()
+    log(f"Test execution started at: {start_time.strftime('%Y-%m-%d %H:%M:%S')}")
+    log(f"Devices: {', '.join(device['name'] for device in DEVICE_POOL)}")
     
-    print("-" * 40)
-    print(f"Tests Passed: {passed_tests}/{total_tests}")
+    test_results = {}
+    device_results = []
     
-    if passed_tests == total_tests and total_tests > 0:
-        print("🎉 ALL TESTS PASSED!")
-        success_rate = 100
-    else:
-        success_rate = (passed_tests / total_tests * 100) if total_tests > 0 else 0
-        print(f"📊 Success Rate: {success_rate:.1f}%")
+    try:
+        device_results = run_parallel(iterations=iterations)
+        test_results = merge_results(device_results)
+        # Workers already wrote their flow_end events to the JSON lines file; only the JUnit report needs them here
+        for entry in device_results:
+            replay_junit_events(entry["events"])
+    except Exception as e:
+        log(f"❌ Test execution failed with error: {str(e)}")
+        test_results['execution_error'] = str(e)
     
-    print_footer()
+    print_summary(test_results, start_time, [lambda: print_device_results(device_results)])
     
     return test_results
 
@@ -114,21 +177,28 @@ def run_individual_test(test_name):
     """Run individual test by name"""
     print_header(f"RUNNING INDIVIDUAL TEST: {test_name.upper()}")
     
-    if test_name.lower() == 'attendance':
-        result = run_attendance_search_test()
-        test_type = "Attendance Report Search"
-    elif test_name.lower() == 'checkin':
-        result = run_checkin_leave_test()
-        test_type = "Check-IN & Leave Application"
-    else:
-        print(f"❌ Unknown test name: {test_name}")
-        print("Available tests: 'attendance', 'checkin'")
-        return False
+    tracer = start_tracing(test_name.lower())
+    try:
+        if test_name.lower() == 'attendance':
+            result = run_flow('attendance_search', run_attendance_search_test)
+            test_type = "Attendance Report Search"
+        elif test_name.lower() == 'checkin':
+            result = run_flow('checkin_leave', run_checkin_leave_test)
+            test_type = "Check-IN & Leave Application"
+        elif test_name.lower() == 'sweep':
+            result = run_flow('attendance_sweep', run_attendance_sweep)
+            test_type = "Attendance Search Sweep"
+        else:
+            log(f"❌ Unknown test name: {test_name}")
+            log("Available tests: 'attendance', 'checkin', 'sweep'")
+            return False
+    finally:
+        finish_tracing(tracer)
     
     if result:
-        print(f"✅ {test_type} Test: PASSED")
+        log(f"✅ {test_type} Test: PASSED")
     else:
-        print(f"❌ {test_type} Test: FAILED")
+        log(f"❌ {test_type} Test: FAILED")
     
     print_footer()
     return result
@@ -136,15 +206,22 @@ def run_individual_test(test_name):
 
 def main():
     """Main function to handle command line arguments"""
-    print("ABC Company Mobile App Automation Test Runner")
-    print("=" * 50)
+    log("ABC Company Mobile App Automation Test Runner")
+    log("=" * 50)
     
-    if len(sys.argv) > 1:
-        test_name = sys.argv[1]
-        run_individual_test(test_name)
-    else:
-        print("Running all automation tests...")
-        run_all_tests()
+    try:
+        if len(sys.argv) > 1 and sys.argv[1] == 'parallel':
+            iterations = int(sys.argv[2]) if len(sys.argv) > 2 else 1
+            run_parallel_tests(iterations)
+        elif len(sys.argv) > 1:
+            test_name = sys.argv[1]
+            run_individual_test(test_name)
+        else:
+            log("Running all automation tests...")
+            run_all_tests()
+    finally:
+        # Writes the JUnit report and any buffered JSON lines
+        close_event_bus()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,9 @@
+"""
+Unit tests for the automation helpers that need no device or Appium server
+Run from the automation directory: python -m pytest tests
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
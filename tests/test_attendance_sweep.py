@@ -0,0 +1,46 @@
+from datetime import datetime
+from test_attendance_search import DATE_FORMAT, date_windows, sweep_queries, within_one_month
+
+
+def day(text):
+    return datetime.strptime(text, DATE_FORMAT)
+
+
+def test_within_one_month_allows_the_same_day_next_month():
+    assert within_one_month(day("15/01/2024"), day("15/01/2024"))
+    assert within_one_month(day("15/01/2024"), day("15/02/2024"))
+    assert not within_one_month(day("15/01/2024"), day("16/02/2024"))
+
+
+def test_within_one_month_clamps_to_short_months_and_year_end():
+    assert within_one_month(day("31/01/2024"), day("29/02/2024"))
+    assert not within_one_month(day("31/01/2024"), day("01/03/2024"))
+    assert within_one_month(day("20/12/2024"), day("20/01/2025"))
+
+
+def test_within_one_month_rejects_reversed_dates():
+    assert not within_one_month(day("10/03/2024"), day("09/03/2024"))
+
+
+def test_date_windows_steps_through_every_length():
+    windows = list(date_windows("01/01/2024", "31/03/2024", window_days=[7, 30], step_days=30))
+    assert windows == [
+        ("01/01/2024", "07/01/2024"), ("01/01/2024", "30/01/2024"),
+        ("31/01/2024", "06/02/2024"), ("31/01/2024", "29/02/2024"),
+        ("01/03/2024", "07/03/2024"), ("01/03/2024", "30/03/2024")
+    ]
+
+
+def test_date_windows_drop_windows_past_the_end_or_over_a_month():
+    windows = list(date_windows("01/02/2024", "29/02/2024", window_days=[29, 31], step_days=30))
+    assert windows == [("01/02/2024", "29/02/2024")]
+
+
+def test_sweep_queries_pairs_windows_with_statuses_up_to_the_cap():
+    queries = sweep_queries(statuses=["Present", "Late"], max_queries=3,
+                            start="01/01/2024", end="31/01/2024", window_days=[7], step_days=7)
+    assert queries == [
+        ("01/01/2024", "07/01/2024", "Present"),
+        ("01/01/2024", "07/01/2024", "Late"),
+        ("08/01/2024", "14/01/2024", "Present")
+    ]
@@ -0,0 +1,38 @@
+import pytest
+from load_schedule import ArrivalSchedule, constant_rate, curve_arrivals
+
+
+def test_constant_rate_spaces_arrivals_evenly():
+    assert constant_rate(4, 2) == [0.0, 0.5, 1.0, 1.5]
+
+
+def test_constant_rate_zero_releases_everyone_at_once():
+    assert constant_rate(3, 0) == [0.0, 0.0, 0.0]
+
+
+def test_flat_curve_matches_constant_rate():
+    offsets = curve_arrivals([(0, 2), (5, 2)])
+    assert len(offsets) == 10
+    assert offsets == pytest.approx([0.25 + index * 0.5 for index in range(10)], abs=0.02)
+
+
+def test_ramp_delivers_its_area_with_arrivals_bunched_late():
+    offsets = curve_arrivals([(0, 0), (10, 2)])
+    assert len(offsets) == 10
+    assert offsets == sorted(offsets)
+    assert 0 < offsets[0] and offsets[-1] <= 10
+    # Expected count t²/10 passes 0.5 and 1.5 before t = 4.9, so only two arrivals fall early
+    assert sum(offset < 4.9 for offset in offsets) == 2
+
+
+def test_scale_multiplies_the_rate():
+    assert len(curve_arrivals([(0, 1), (4, 1), (6, 0)], scale=3)) == 15
+
+
+def test_schedule_hands_out_each_arrival_once():
+    schedule = ArrivalSchedule([0.0, 1.5])
+    schedule.begin()
+    first, second = schedule.take(), schedule.take()
+    assert (first[0], second[0]) == (0, 1)
+    assert second[1] - first[1] == pytest.approx(1.5)
+    assert schedule.take() is None
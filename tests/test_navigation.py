@@ -0,0 +1,31 @@
+from navigation import NAVIGATION_EDGES, SCREENS, shortest_route
+
+
+def test_route_to_same_screen_is_empty():
+    assert shortest_route("hr", "hr") == []
+
+
+def test_route_follows_menus_down_from_home():
+    assert shortest_route("home", "my_attendance") == [
+        ("home", "hr", ("tap", "hr_menu")),
+        ("hr", "my_attendance", ("tap", "my_attendance_menu"))
+    ]
+
+
+def test_route_prefers_back_over_tapping_the_menu():
+    assert shortest_route("checkin", "hr") == [("checkin", "hr", ("back",))]
+
+
+def test_excluded_edge_is_routed_around():
+    back = ("checkin", "hr", ("back",))
+    assert shortest_route("checkin", "hr", excluded={back}) == [("checkin", "hr", ("tap", "hr_menu"))]
+
+
+def test_unreachable_screen_gives_none():
+    assert shortest_route("home", "login") is None
+    assert shortest_route("hr", "home", excluded={("hr", "home", ("back",))}) is None
+
+
+def test_every_edge_joins_known_screens():
+    for start, end, _ in NAVIGATION_EDGES:
+        assert start in SCREENS and end in SCREENS
@@ -0,0 +1,37 @@
+from screenshot_pipeline import ScreenshotRing
+
+
+def frame(name, size):
+    return f"screenshots/{name}.png", "A" * size
+
+
+def test_oldest_frames_drop_past_the_frame_limit():
+    ring = ScreenshotRing(max_frames=2, max_bytes=1000)
+    for name in ("a", "b", "c"):
+        ring.push(*frame(name, 10))
+    assert [path for path, _ in ring.frames] == ["screenshots/b.png", "screenshots/c.png"]
+    assert ring.size == 20
+
+
+def test_oldest_frames_drop_past_the_byte_cap():
+    ring = ScreenshotRing(max_frames=10, max_bytes=250)
+    for name in ("a", "b", "c"):
+        ring.push(*frame(name, 100))
+    assert [path for path, _ in ring.frames] == ["screenshots/b.png", "screenshots/c.png"]
+    assert ring.size == 200
+
+
+def test_frame_larger_than_the_cap_is_not_kept():
+    ring = ScreenshotRing(max_frames=10, max_bytes=50)
+    ring.push(*frame("a", 10))
+    ring.push(*frame("huge", 60))
+    assert not ring.frames
+    assert ring.size == 0
+
+
+def test_drain_empties_the_ring_oldest_first():
+    ring = ScreenshotRing(max_frames=10, max_bytes=1000)
+    ring.push(*frame("a", 10))
+    ring.push(*frame("b", 10))
+    assert [path for path, _ in ring.drain()] == ["screenshots/a.png", "screenshots/b.png"]
+    assert not ring.frames and ring.size == 0
@@ -0,0 +1,58 @@
+from selector_cache import SelectorCache
+
+KEY = "my_attendance.search_button"
+SELECTORS = [("id", "search_button"), ("xpath", "//android.widget.Button[@text='Search']")]
+
+
+def cache(tmp_path, max_misses=3):
+    return SelectorCache(path=str(tmp_path / "selectors.json"), max_misses=max_misses)
+
+
+def test_learned_selector_moves_to_the_front(tmp_path):
+    selectors = cache(tmp_path)
+    selectors.record_hit(KEY, SELECTORS[1])
+    assert selectors.order(KEY, SELECTORS) == [SELECTORS[1], SELECTORS[0]]
+
+
+def test_winner_is_evicted_after_max_consecutive_misses(tmp_path):
+    selectors = cache(tmp_path, max_misses=2)
+    selectors.record_hit(KEY, SELECTORS[1])
+    selectors.record_miss(KEY, SELECTORS[1])
+    assert KEY in selectors.entries
+    selectors.record_miss(KEY, SELECTORS[1])
+    assert KEY not in selectors.entries
+    assert selectors.order(KEY, SELECTORS) == SELECTORS
+
+
+def test_hit_resets_the_miss_count(tmp_path):
+    selectors = cache(tmp_path, max_misses=2)
+    selectors.record_hit(KEY, SELECTORS[1])
+    selectors.record_miss(KEY, SELECTORS[1])
+    selectors.record_hit(KEY, SELECTORS[1])
+    selectors.record_miss(KEY, SELECTORS[1])
+    assert selectors.entries[KEY]["misses"] == 1
+
+
+def test_miss_on_another_selector_keeps_the_winner(tmp_path):
+    selectors = cache(tmp_path, max_misses=1)
+    selectors.record_hit(KEY, SELECTORS[1])
+    selectors.record_miss(KEY, SELECTORS[0])
+    assert selectors.entries[KEY]["by"] == "xpath"
+
+
+def test_save_merges_with_entries_saved_by_another_process(tmp_path):
+    first, second = cache(tmp_path), cache(tmp_path)
+    first.record_hit(KEY, SELECTORS[1])
+    first.save()
+    second.record_hit("hr.checkin_menu", ("id", "checkin_menu"))
+    second.save()
+    assert set(cache(tmp_path).entries) == {KEY, "hr.checkin_menu"}
+
+
+def test_eviction_is_saved(tmp_path):
+    selectors = cache(tmp_path, max_misses=1)
+    selectors.record_hit(KEY, SELECTORS[1])
+    selectors.save()
+    selectors.record_miss(KEY, SELECTORS[1])
+    selectors.save()
+    assert cache(tmp_path).entries == {}
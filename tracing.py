@@ -0,0 +1,96 @@
+"""
+Span tracing for flow steps, BaseTest helpers and WebDriver commands
+Exports one Chrome/Perfetto trace JSON per run
+"""
+
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from config import TRACING
+from instrumentation import add_listener, remove_listener
+from events import log
+
+
+class SpanTracer:
+    """Records steps and commands as complete ("X") trace events; nesting comes from the timestamps"""
+
+    def __init__(self, run_name="run"):
+        self.run_name = run_name
+        self.events = []
+        self.lock = threading.Lock()
+        self.pid = os.getpid()
+        # perf_counter has no epoch, so anchor it to wall-clock time once
+        self.origin = time.perf_counter()
+        self.origin_us = time.time() * 1_000_000
+
+    def timestamp(self, seconds):
+        """perf_counter seconds to trace microseconds"""
+        return self.origin_us + (seconds - self.origin) * 1_000_000
+
+    def add_span(self, name, category, start, end, args=None):
+        event = {
+            "name": name,
+            "cat": category,
+            "ph": "X",
+            "ts": self.timestamp(start),
+            "dur": (end - start) * 1_000_000,
+            "pid": self.pid,
+            "tid": threading.get_ident()
+        }
+        if args:
+            event["args"] = args
+        with self.lock:
+            self.events.append(event)
+
+    def step_started(self, name, start):
+        """Spans are written whole when the step finishes"""
+
+    def step_finished(self, name, start, end, outcome):
+        self.add_span(name, "step", start, end, {"outcome": outcome})
+
+    def command_finished(self, command, start, end):
+        self.add_span(command, "webdriver", start, end)
+
+    def start(self):
+        add_listener(self)
+        return self
+
+    def stop(self):
+        remove_listener(self)
+
+    def export(self, output_dir=None):
+        """Write the trace file and return its path"""
+        output_dir = output_dir or TRACING["output_dir"]
+        os.makedirs(output_dir, exist_ok=True)
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        filepath = os.path.join(output_dir, f"trace_{self.run_name}_{timestamp}.json")
+
+        with self.lock:
+            events = sorted(self.events, key=lambda event: event["ts"])
+        metadata = [
+            {"name": "process_name", "ph": "M", "pid": self.pid, "args": {"name": f"ABC automation ({self.run_name})"}}
+        ]
+        with open(filepath, "w") as f:
+            json.dump({"traceEvents": metadata + events, "displayTimeUnit": "ms"}, f)
+        return filepath
+
+
+def start_tracing(run_name="run"):
+    """Start a tracer if tracing is enabled, else return None"""
+    return SpanTracer(run_name).start() if TRACING["enabled"] else None
+
+
+def finish_tracing(tracer):
+    """Stop a tracer from start_tracing and export its trace"""
+    if tracer is None:
+        return None
+    tracer.stop()
+    try:
+        filepath = tracer.export()
+        log(f"✓ Trace written: {filepath} ({len(tracer.events)} spans)")
+        return filepath
+    except Exception as e:
+        log(f"✗ Failed to write trace: {str(e)}")
+        return None
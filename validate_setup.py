@@ -1,3 +1,4 @@
+"""
 Setup Validation Script for ABC Company Mobile App Automation
 Validates project structure, dependencies, and configuration
 """